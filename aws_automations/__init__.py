@@ -1,14 +1,30 @@
 """AWS automation helpers."""
 
-from .s3_cleanup import run_cleanup as run_s3_cleanup
-from .ec2_cleanup import run_ec2_cleanup
-from .lambda_cleanup import run_lambda_cleanup
-from .ebs_cleanup import run_ebs_cleanup
-from .cloudwatch_cleanup import run_cloudwatch_cleanup
-from .iam_cleanup import run_iam_cleanup
+import importlib
+
 from .main import main
 from .menu import interactive_menu
 
+# Cleanup entry points load on first access, so importing the package skips unused services
+_LAZY_EXPORTS = {
+    "run_s3_cleanup": (".s3_cleanup", "run_cleanup"),
+    "run_ec2_cleanup": (".ec2_cleanup", "run_ec2_cleanup"),
+    "run_lambda_cleanup": (".lambda_cleanup", "run_lambda_cleanup"),
+    "run_ebs_cleanup": (".ebs_cleanup", "run_ebs_cleanup"),
+    "run_cloudwatch_cleanup": (".cloudwatch_cleanup", "run_cloudwatch_cleanup"),
+    "run_iam_cleanup": (".iam_cleanup", "run_iam_cleanup"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_EXPORTS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "run_s3_cleanup",
     "run_ec2_cleanup", 
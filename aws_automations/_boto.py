@@ -0,0 +1,169 @@
+"""Shared boto3 client construction for the cleanup modules."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_POOL_CONNECTIONS = 64
+
+CLIENT_CONFIG = Config(
+    max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True,
+    # Fail fast on dead connections; timed-out requests are retried like any other transient error
+    connect_timeout=5,
+    read_timeout=30,
+)
+
+# Error codes botocore's retry handler treats as throttling
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+        "TransactionInProgressException",
+        "RequestLimitExceeded",
+        "BandwidthLimitExceeded",
+        "LimitExceededException",
+        "RequestThrottled",
+        "SlowDown",
+        "PriorRequestNotComplete",
+        "EC2ThrottledException",
+    }
+)
+
+
+def _pool_size(max_pool_connections: Optional[int]) -> int:
+    return max(max_pool_connections or 0, DEFAULT_MAX_POOL_CONNECTIONS)
+
+
+def client_config(max_pool_connections: Optional[int] = None) -> Config:
+    """Return the shared client config, widening the connection pool when more workers need it."""
+    pool_size = _pool_size(max_pool_connections)
+    if pool_size == DEFAULT_MAX_POOL_CONNECTIONS:
+        return CLIENT_CONFIG
+    return CLIENT_CONFIG.merge(Config(max_pool_connections=pool_size))
+
+
+# Sessions are not thread-safe while building clients, so client creation is serialized
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _default_session() -> boto3.Session:
+    """One session behind every cached client, so each service model is loaded and parsed only once."""
+    return boto3.Session()
+
+
+@lru_cache(maxsize=None)
+def get_client(
+    service: str,
+    region_name: Optional[str] = None,
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+) -> Any:
+    """Return a process-wide client; boto3 clients are thread-safe and keep their connection pool warm."""
+    with _client_lock:
+        return _default_session().client(service, region_name=region_name, config=client_config(max_pool_connections))
+
+
+# Clients built from caller-supplied sessions, dropped along with their session
+_session_clients: "weakref.WeakKeyDictionary[boto3.Session, Dict[Tuple[str, Optional[str], int], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def make_client(
+    service: str,
+    region_name: Optional[str] = None,
+    *,
+    session: Optional[boto3.Session] = None,
+    max_pool_connections: Optional[int] = None,
+) -> Any:
+    """Return a client for ``service`` and region, reused across runs that share ``session`` (or pass none)."""
+    pool_size = _pool_size(max_pool_connections)
+    if session is None:
+        return get_client(service, region_name, pool_size)
+
+    key = (service, region_name, pool_size)
+    with _client_lock:
+        clients = _session_clients.setdefault(session, {})
+        if key not in clients:
+            clients[key] = session.client(service, region_name=region_name, config=client_config(pool_size))
+        return clients[key]
+
+
+def ec2_tag_filters(required_tag: Optional[dict]) -> List[Dict[str, Any]]:
+    """Translate a ``require_tag`` setting into EC2 ``Filters`` so untagged resources are never returned."""
+    if not required_tag:
+        return []
+    value = required_tag.get("value")
+    if value is None:
+        return [{"Name": "tag-key", "Values": [required_tag["key"]]}]
+    return [{"Name": f"tag:{required_tag['key']}", "Values": [value]}]
+
+
+def is_throttling_error(exc: ClientError) -> bool:
+    """True when ``exc`` is a throttling error that outlasted the client's adaptive retries."""
+    return exc.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def map_until_throttled(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    item_id: Callable[[T], str],
+    summary: dict,
+) -> Iterator[R]:
+    """Like ``executor.map``, but stop at the first throttling error instead of raising it.
+
+    Work not yet started is cancelled, work already running is still collected, and the IDs of
+    items left unprocessed are appended to ``summary["throttled"]`` so a partial summary survives.
+    """
+    pending = deque((item, executor.submit(fn, item)) for item in items)
+    while pending:
+        item, future = pending.popleft()
+        try:
+            result = future.result()
+        except ClientError as exc:
+            if not is_throttling_error(exc):
+                for _, other in pending:
+                    other.cancel()
+                raise
+            logger.warning("Throttled while processing %s, stopping: %s", item_id(item), exc)
+            break
+        yield result
+    else:
+        return
+
+    unprocessed = [item_id(item)]
+    for other_item, other in pending:
+        if other.cancel():
+            unprocessed.append(item_id(other_item))
+            continue
+        try:
+            result = other.result()
+        except ClientError as exc:
+            if not is_throttling_error(exc):
+                raise
+            unprocessed.append(item_id(other_item))
+            continue
+        yield result
+    summary.setdefault("throttled", []).extend(unprocessed)
@@ -0,0 +1,6 @@
+"""Shared Rich console for the CLI entry points."""
+
+from rich.console import Console
+
+# Console probes the terminal when it is created, so every screen and live view shares this one
+CONSOLE = Console()
@@ -0,0 +1,32 @@
+"""Glob matching for the ``name_patterns`` setting shared by the cleanup modules."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Sequence, Tuple
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@lru_cache(maxsize=256)
+def compile_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Union ``patterns`` into one regex so each name is matched once rather than once per pattern."""
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+@lru_cache(maxsize=256)
+def partition_patterns(patterns: Tuple[str, ...]) -> Tuple[FrozenSet[str], Optional[re.Pattern]]:
+    """Split ``patterns`` into exact names, checked with a set lookup, and a regex for the real globs."""
+    literals = frozenset(pattern for pattern in patterns if _GLOB_CHARS.isdisjoint(pattern))
+    globs = tuple(pattern for pattern in patterns if pattern not in literals)
+    return literals, compile_patterns(globs) if globs else None
+
+
+def matches_patterns(name: str, patterns: Sequence[str]) -> bool:
+    """True when ``name`` matches any glob in ``patterns``, or when there are no patterns."""
+    if not patterns:
+        return True
+    literals, regex = partition_patterns(tuple(patterns))
+    return name in literals or (regex is not None and regex.match(name) is not None)
@@ -0,0 +1,55 @@
+"""Compact progress records kept by the live CLI views."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+@dataclass
+class ProgressReport:
+    """The fields of a progress callback report that the live table shows.
+
+    Slotted so that tables with many thousands of rows hold no per-row ``__dict__``; counters a
+    service does not report stay None. Build one from a callback dict with :meth:`from_dict`.
+    """
+
+    __slots__ = (
+        "resource",
+        "resource_type",
+        "status",
+        "objects_deleted",
+        "objects_planned",
+        "versions_deleted",
+        "versions_planned",
+        "volumes",
+        "streams_deleted",
+        "deleted",
+    )
+
+    resource: str
+    resource_type: str
+    status: str
+    objects_deleted: Optional[Any]
+    objects_planned: Optional[Any]
+    versions_deleted: Optional[Any]
+    versions_planned: Optional[Any]
+    volumes: Optional[Any]
+    streams_deleted: Optional[Any]
+    deleted: Optional[Any]
+
+    @classmethod
+    def from_dict(cls, report: Mapping[str, Any]) -> "ProgressReport":
+        get = report.get
+        return cls(
+            str(get("resource", "unknown")),
+            str(get("resource_type", get("type", "-"))),
+            str(get("status", "in_progress")),
+            get("objects_deleted"),
+            get("objects_planned"),
+            get("versions_deleted"),
+            get("versions_planned"),
+            get("volumes"),
+            get("streams_deleted"),
+            get("deleted"),
+        )
@@ -0,0 +1,70 @@
+"""Per-resource report collection for the cleanup summaries."""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+DEFAULT_MAX_REPORTS_IN_MEMORY = 10_000
+
+
+if orjson is not None:
+    # Datetimes go through default=str, as with the json fallback, so output does not depend on the extra
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_line(record: dict) -> bytes:
+    """Serialize ``record`` as one JSON Lines entry."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=_ORJSON_OPTIONS) + b"\n"
+    return (json.dumps(record, default=str) + "\n").encode()
+
+
+def dumps_document(data: dict) -> bytes:
+    """Serialize ``data`` as indented JSON followed by a newline."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2) + b"\n"
+    return (json.dumps(data, default=str, indent=2) + "\n").encode()
+
+
+class ReportWriter:
+    """Append reports to ``summary`` lists, or stream them to ``report_path`` as JSON Lines.
+
+    Without a ``report_path`` each list is capped at ``max_reports_in_memory`` entries and
+    ``summary["reports_truncated"]`` is set once the cap is hit.
+    """
+
+    def __init__(self, summary: dict, config: dict) -> None:
+        self._summary = summary
+        self._max_in_memory = int(config.get("max_reports_in_memory", DEFAULT_MAX_REPORTS_IN_MEMORY))
+        self._handle: Optional[IO[bytes]] = None
+        report_path = config.get("report_path")
+        if report_path:
+            self._handle = open(report_path, "ab")
+            summary["report_path"] = str(report_path)
+
+    def add(self, section: str, report: dict) -> None:
+        if self._handle is not None:
+            self._handle.write(dumps_line({"section": section, **report}))
+            return
+        reports = self._summary[section]
+        if len(reports) < self._max_in_memory:
+            reports.append(report)
+        else:
+            self._summary["reports_truncated"] = True
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,10 @@
+"""Datetime helpers shared by the cleanup modules."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+def ensure_tz(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC; botocore already returns aware timestamps from AWS responses."""
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
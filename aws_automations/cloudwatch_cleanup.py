@@ -1,27 +1,29 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
-logger = logging.getLogger("cloudwatch_cleanup")
-
+from ._boto import is_throttling_error, make_client, map_until_throttled
+from ._patterns import matches_patterns
+from ._reports import ReportWriter
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+logger = logging.getLogger("cloudwatch_cleanup")
 
 
 def log_group_matches_patterns(name: str, patterns: List[str]) -> bool:
-    if not patterns:
-        return True
-    import fnmatch
-    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    return matches_patterns(name, patterns)
 
 
-def get_log_group_last_event(logs_client, log_group_name: str) -> Optional[datetime]:
+def _get_log_group_last_event_ms(logs_client, log_group_name: str) -> Optional[int]:
     try:
         response = logs_client.describe_log_streams(
             logGroupName=log_group_name,
@@ -32,13 +34,25 @@ def get_log_group_last_event(logs_client, log_group_name: str) -> Optional[datet
         
         streams = response.get("logStreams", [])
         if streams and "lastEventTime" in streams[0]:
-            return datetime.fromtimestamp(streams[0]["lastEventTime"] / 1000, tz=timezone.utc)
+            return int(streams[0]["lastEventTime"])
         return None
     except ClientError:
         return None
 
 
-def should_target_log_group(log_group: dict, config: dict, now: datetime, logs_client) -> bool:
+def get_log_group_last_event(logs_client, log_group_name: str) -> Optional[datetime]:
+    last_event_ms = _get_log_group_last_event_ms(logs_client, log_group_name)
+    if last_event_ms is None:
+        return None
+    return datetime.fromtimestamp(last_event_ms / 1000, tz=timezone.utc)
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    return int(dt.timestamp() * 1000)
+
+
+def log_group_passes_filters(log_group: dict, config: dict) -> bool:
+    """Check a log group against the name filters; makes no API calls."""
     log_group_name = log_group["logGroupName"]
     
     # Check target/ignore lists
@@ -48,37 +62,32 @@ def should_target_log_group(log_group: dict, config: dict, now: datetime, logs_c
         return False
     
     # Check name patterns
-    if not log_group_matches_patterns(log_group_name, config.get("name_patterns", [])):
-        return False
-    
-    # Check last activity
-    retention_days = config.get("log_group_retention_days", 30)
-    last_event = get_log_group_last_event(logs_client, log_group_name)
-    
-    if last_event:
-        cutoff = now - timedelta(days=retention_days)
-        if last_event > cutoff:
-            logger.debug("Skipping %s: recent activity", log_group_name)
+    return log_group_matches_patterns(log_group_name, config.get("name_patterns", []))
+
+
+def log_group_is_stale(log_group: dict, last_event_ms: Optional[int], cutoff_ms: int) -> bool:
+    """Check the newest event in a log group, or its creation time when it has none, against ``cutoff_ms``."""
+    if last_event_ms is not None:
+        if last_event_ms > cutoff_ms:
+            logger.debug("Skipping %s: recent activity", log_group["logGroupName"])
             return False
-    else:
+    elif log_group["creationTime"] > cutoff_ms:
         # If no events, check creation time
-        creation_time = datetime.fromtimestamp(log_group["creationTime"] / 1000, tz=timezone.utc)
-        cutoff = now - timedelta(days=retention_days)
-        if creation_time > cutoff:
-            logger.debug("Skipping %s: log group age below retention", log_group_name)
-            return False
-    
+        logger.debug("Skipping %s: log group age below retention", log_group["logGroupName"])
+        return False
     return True
 
 
-def should_target_log_stream(stream: dict, config: dict, now: datetime) -> bool:
-    if "lastEventTime" not in stream:
+def should_target_log_group(log_group: dict, config: dict, cutoff_ms: int, logs_client) -> bool:
+    """Check a log group against filters; ``cutoff_ms`` is epoch milliseconds like the Logs API."""
+    if not log_group_passes_filters(log_group, config):
         return False
-    
-    last_event = datetime.fromtimestamp(stream["lastEventTime"] / 1000, tz=timezone.utc)
-    cutoff = now - timedelta(days=config.get("log_stream_retention_days", 7))
-    
-    return last_event <= cutoff
+    last_event_ms = _get_log_group_last_event_ms(logs_client, log_group["logGroupName"])
+    return log_group_is_stale(log_group, last_event_ms, cutoff_ms)
+
+
+def should_target_log_stream(stream: dict, cutoff_ms: int) -> bool:
+    return "lastEventTime" in stream and stream["lastEventTime"] <= cutoff_ms
 
 
 def delete_log_group(logs_client, log_group_name: str, dry_run: bool) -> bool:
@@ -91,6 +100,8 @@ def delete_log_group(logs_client, log_group_name: str, dry_run: bool) -> bool:
         logger.info("Deleted log group %s", log_group_name)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not delete log group %s: %s", log_group_name, exc)
         return False
 
@@ -108,10 +119,142 @@ def delete_log_stream(logs_client, log_group_name: str, log_stream_name: str, dr
         logger.info("Deleted log stream %s from %s", log_stream_name, log_group_name)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not delete log stream %s: %s", log_stream_name, exc)
         return False
 
 
+def _normalize_config(config: dict) -> dict:
+    """Copy ``config`` with its ID and state lists frozen into sets for O(1) membership checks."""
+    cfg = dict(config)
+    for key in ("target_log_groups", "ignore_log_groups"):
+        cfg[key] = frozenset(config.get(key) or ())
+    cfg["name_patterns"] = tuple(config.get("name_patterns") or ())
+    return cfg
+
+
+def _scan_log_group(
+    logs_client,
+    log_group: dict,
+    group_cutoff_ms: int,
+    stream_cutoff_ms: int,
+    check_group: bool = True,
+) -> Tuple[bool, List[str]]:
+    """Return whether the whole group is stale, and otherwise the names of its stale streams.
+
+    A single ``describe_log_streams`` pass, newest first, serves both questions: the first
+    stream decides the group and the rest of the pass collects streams past ``stream_cutoff_ms``.
+    With ``check_group`` off the group is never reported stale and only its streams are collected.
+    """
+    paginator = logs_client.get_paginator("describe_log_streams")
+    pages = paginator.paginate(logGroupName=log_group["logGroupName"], orderBy="LastEventTime", descending=True)
+    streams = chain.from_iterable(page.get("logStreams", []) for page in pages)
+
+    newest = next(streams, None)
+    last_event_ms = newest.get("lastEventTime") if newest is not None else None
+    if check_group and log_group_is_stale(log_group, last_event_ms, group_cutoff_ms):
+        return True, []
+    if newest is None:
+        return False, []
+
+    stale_streams = [
+        stream["logStreamName"]
+        for stream in chain((newest,), streams)
+        if should_target_log_stream(stream, stream_cutoff_ms)
+    ]
+    return False, stale_streams
+
+
+def _process_log_group(
+    logs_client,
+    log_group: dict,
+    config: dict,
+    group_cutoff_ms: int,
+    stream_cutoff_ms: int,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    delete_executor: Optional[Executor] = None,
+) -> dict:
+    """Delete a stale log group, or its stale streams; safe to run from a worker thread.
+
+    CloudWatch Logs has no bulk stream delete, so stale streams are fanned out over
+    ``delete_executor`` when one is given.
+    """
+    log_group_name = log_group["logGroupName"]
+    result: Dict[str, Any] = {"deleted_group": False, "streams_deleted": 0, "report": None}
+
+    # The name filters only pick groups to delete whole; stale streams are cleaned in every group
+    group_targeted = log_group_passes_filters(log_group, config)
+
+    try:
+        group_stale, target_streams = _scan_log_group(
+            logs_client, log_group, group_cutoff_ms, stream_cutoff_ms, check_group=group_targeted
+        )
+    except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
+        logger.warning("Could not process streams for %s: %s", log_group_name, exc)
+        return result
+
+    if group_stale:
+        logger.info("Processing log group %s", log_group_name)
+
+        if progress_callback:
+            progress_callback(
+                {
+                    "resource": log_group_name,
+                    "resource_type": "log_group",
+                    "status": "planned",
+                    "streams_deleted": 0,
+                    "deleted": 0,
+                }
+            )
+
+        result["deleted_group"] = delete_log_group(logs_client, log_group_name, dry_run)
+        result["report"] = {
+            "log_group_name": log_group_name,
+            "creation_time": log_group["creationTime"],
+        }
+
+        if progress_callback:
+            progress_callback(
+                {
+                    "resource": log_group_name,
+                    "resource_type": "log_group",
+                    "status": "completed",
+                    "streams_deleted": 0,
+                    "deleted": 1 if not dry_run else 0,
+                }
+            )
+        return result
+
+    delete_stream = partial(delete_log_stream, logs_client, log_group_name, dry_run=dry_run)
+    # Dry runs and single deletes make no concurrent API calls, so keep them off the pool.
+    concurrent = delete_executor is not None and not dry_run and len(target_streams) > 1
+    mapper = delete_executor.map if concurrent else map  # type: ignore[union-attr]
+    streams_deleted = sum(mapper(delete_stream, target_streams))
+
+    if streams_deleted > 0:
+        result["streams_deleted"] = streams_deleted
+        result["report"] = {
+            "log_group_name": log_group_name,
+            "streams_deleted": streams_deleted,
+        }
+        if progress_callback:
+            progress_callback(
+                {
+                    "resource": log_group_name,
+                    "resource_type": "log_group",
+                    "status": "completed",
+                    "streams_deleted": streams_deleted,
+                    "deleted": 0,
+                }
+            )
+
+    return result
+
+
 def run_cloudwatch_cleanup(
     config: dict,
     *,
@@ -120,87 +263,59 @@ def run_cloudwatch_cleanup(
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> dict:
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.get("region_name"))
-    logs_client = sess.client("logs", region_name=config.get("region_name"))
+    cfg = _normalize_config(config)
+    group_cutoff_ms = to_epoch_ms(now - timedelta(days=config.get("log_group_retention_days", 30)))
+    stream_cutoff_ms = to_epoch_ms(now - timedelta(days=config.get("log_stream_retention_days", 7)))
+    max_workers = config.get("max_workers", 16)
+    max_concurrent_deletes = config.get("max_concurrent_deletes", 64)
+    # boto3 low-level clients are thread-safe, so one client is shared by every worker.
+    logs_client = make_client(
+        "logs",
+        config.get("region_name"),
+        session=session,
+        max_pool_connections=max_workers + max_concurrent_deletes,
+    )
     
-    # Get log groups
+    # Stream log groups page by page so workers start on the first page
     paginator = logs_client.get_paginator("describe_log_groups")
-    log_groups = []
-    for page in paginator.paginate():
-        log_groups.extend(page.get("logGroups", []))
+    log_groups = chain.from_iterable(page.get("logGroups", []) for page in paginator.paginate())
     
     summary = {
         "dry_run": dry_run,
-        "log_groups_scanned": len(log_groups),
+        "log_groups_scanned": 0,
         "log_groups_deleted": 0,
         "log_streams_deleted": 0,
         "log_group_reports": [],
     }
-    
-    for log_group in log_groups:
-        log_group_name = log_group["logGroupName"]
-        
-        if should_target_log_group(log_group, config, now, logs_client):
-            logger.info("Processing log group %s", log_group_name)
-            
-            if progress_callback:
-                progress_callback(
-                    {
-                        "resource": log_group_name,
-                        "resource_type": "log_group",
-                        "status": "planned",
-                        "streams_deleted": 0,
-                        "deleted": 0,
-                    }
-                )
-            
-            if delete_log_group(logs_client, log_group_name, dry_run):
-                summary["log_groups_deleted"] += 1
-            
-            summary["log_group_reports"].append({
-                "log_group_name": log_group_name,
-                "creation_time": log_group["creationTime"],
-            })
-            
-            if progress_callback:
-                progress_callback(
-                    {
-                        "resource": log_group_name,
-                        "resource_type": "log_group",
-                        "status": "completed",
-                        "streams_deleted": 0,
-                        "deleted": 1 if not dry_run else 0,
-                    }
-                )
-        else:
-            # Check for old log streams within the group
-            try:
-                streams_paginator = logs_client.get_paginator("describe_log_streams")
-                streams_deleted = 0
-                
-                for streams_page in streams_paginator.paginate(logGroupName=log_group_name):
-                    for stream in streams_page.get("logStreams", []):
-                        if should_target_log_stream(stream, config, now):
-                            if delete_log_stream(logs_client, log_group_name, stream["logStreamName"], dry_run):
-                                streams_deleted += 1
-                
-                if streams_deleted > 0:
-                    summary["log_streams_deleted"] += streams_deleted
-                    summary["log_group_reports"].append({
-                        "log_group_name": log_group_name,
-                        "streams_deleted": streams_deleted,
-                    })
-                    if progress_callback:
-                        progress_callback(
-                            {
-                                "resource": log_group_name,
-                                "resource_type": "log_group",
-                                "status": "completed",
-                                "streams_deleted": streams_deleted,
-                                "deleted": 0,
-                            }
-                        )
-            except ClientError as exc:
-                logger.warning("Could not process streams for %s: %s", log_group_name, exc)
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    # Stream deletes get their own pool so group workers waiting on them cannot starve it.
+    delete_pool = ThreadPoolExecutor(max_workers=max_concurrent_deletes)
+    with ReportWriter(summary, config) as reports, delete_pool as delete_executor:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            process = partial(
+                _process_log_group,
+                logs_client,
+                config=cfg,
+                group_cutoff_ms=group_cutoff_ms,
+                stream_cutoff_ms=stream_cutoff_ms,
+                dry_run=dry_run,
+                progress_callback=locked_callback if progress_callback else None,
+                delete_executor=delete_executor,
+            )
+            results = map_until_throttled(executor, process, log_groups, itemgetter("logGroupName"), summary)
+            for result in results:
+                summary["log_groups_scanned"] += 1
+                if result["deleted_group"]:
+                    summary["log_groups_deleted"] += 1
+                summary["log_streams_deleted"] += result["streams_deleted"]
+                if result["report"]:
+                    reports.add("log_group_reports", result["report"])
     
     return summary
@@ -1,10 +1,117 @@
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, List, Optional
 
-import yaml
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None  # type: ignore[assignment]
+
+
+def _loads_yaml(text: bytes) -> Any:
+    # Imported on first use so commands that never read a YAML config (--help, TOML/JSON configs) skip PyYAML
+    import yaml
+
+    # libyaml's C loader is much faster when PyYAML was built against it
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def _loads_toml(text: bytes) -> Any:
+    try:
+        import tomllib  # type: ignore[import-not-found]
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib  # type: ignore[import-not-found,no-redef]
+        except ImportError:
+            raise ValueError("TOML configs need Python 3.11+ or the tomli package") from None
+    return tomllib.loads(text.decode())
+
+
+def _loads_json(text: bytes) -> Any:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_name(path.name + ".cache.json")
+
+
+def _source_key(text: bytes) -> dict:
+    """Identify the config contents a sidecar was built from; timestamps alone miss same-second edits."""
+    return {"sha256": hashlib.sha256(text).hexdigest(), "size": len(text)}
+
+
+def _read_sidecar(path: Path, source: dict) -> Any:
+    """Return the JSON cache of a YAML config if it was built from exactly ``source``, else None."""
+    try:
+        envelope = _loads_json(_sidecar_path(path).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(envelope, dict) or envelope.get("source") != source or "data" not in envelope:
+        return None
+    return envelope["data"]
+
+
+def _write_sidecar(path: Path, source: dict, data: Any) -> None:
+    """Best effort: configs on read-only filesystems, or with values JSON cannot hold, go uncached."""
+    try:
+        text = json.dumps({"source": source, "data": data})
+    except (TypeError, ValueError):
+        return
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w") as handle:
+            handle.write(text)
+        os.replace(tmp_path, _sidecar_path(path))
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+
+
+@lru_cache(maxsize=32)
+def _parse_config_file(path: str, mtime_ns: int) -> Any:
+    """Parse a YAML, JSON or TOML config file; keyed on mtime so edits are picked up.
+
+    YAML parses are saved to a ``<config>.cache.json`` sidecar along with a hash of the YAML,
+    and later runs load the sidecar instead only while that hash still matches.
+    """
+    config_path = Path(path)
+    suffix = config_path.suffix.lower()
+    if suffix == ".json":
+        return _loads_json(config_path.read_bytes())
+    if suffix == ".toml":
+        return _loads_toml(config_path.read_bytes())
+    text = config_path.read_bytes()
+    source = _source_key(text)
+    data = _read_sidecar(config_path, source)
+    if data is None:
+        data = _loads_yaml(text)
+        _write_sidecar(config_path, source, data)
+    return data
+
+
+def read_config_file(path: str | Path) -> Any:
+    """Return the parsed contents of ``path``, reusing the last parse while the file is unchanged.
+
+    The result is shared between callers and must not be mutated.
+    """
+    config_path = Path(path)
+    return _parse_config_file(str(config_path), config_path.stat().st_mtime_ns)
 
 
 @dataclass
@@ -30,6 +137,10 @@ class CleanupConfig:
     include_versioned_objects: bool = True
     require_tag: Optional[BucketTagFilter] = None
     max_delete_batch: int = 1000
+    max_workers: int = 16
+    max_concurrent_deletes: int = 16
+    list_prefix_partitions: Optional[List[str]] = None
+    use_lifecycle_for_bulk: bool = False
 
     @staticmethod
     def from_file(path: str | Path) -> "CleanupConfig":
@@ -37,7 +148,7 @@ class CleanupConfig:
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        raw = yaml.safe_load(config_path.read_text()) or {}
+        raw = read_config_file(config_path) or {}
         if isinstance(raw, dict) and isinstance(raw.get("s3"), dict):
             s3_raw = dict(raw["s3"])
             if "region_name" in raw and "region_name" not in s3_raw:
@@ -60,8 +171,23 @@ class CleanupConfig:
             include_versioned_objects=bool(data.get("include_versioned_objects", True)),
             require_tag=tag_filter,
             max_delete_batch=int(data.get("max_delete_batch", 1000)),
+            max_workers=int(data.get("max_workers", 16)),
+            max_concurrent_deletes=int(data.get("max_concurrent_deletes", 16)),
+            list_prefix_partitions=CleanupConfig._parse_prefix_partitions(data.get("list_prefix_partitions")),
+            use_lifecycle_for_bulk=bool(data.get("use_lifecycle_for_bulk", False)),
         )
 
+    @staticmethod
+    def _parse_prefix_partitions(raw: Optional[List[str]]) -> Optional[List[str]]:
+        if not raw:
+            return None
+        partitions = [str(prefix) for prefix in raw]
+        for prefix in partitions:
+            overlapping = [other for other in partitions if other != prefix and other.startswith(prefix)]
+            if overlapping:
+                raise ValueError(f"list_prefix_partitions entries overlap: {prefix!r} and {overlapping[0]!r}")
+        return list(dict.fromkeys(partitions))
+
     @staticmethod
     def _parse_tag_filter(raw: Optional[dict]) -> Optional[BucketTagFilter]:
         if not raw:
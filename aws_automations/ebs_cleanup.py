@@ -1,38 +1,44 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
-logger = logging.getLogger("ebs_cleanup")
+from ._boto import ec2_tag_filters, is_throttling_error, make_client, map_until_throttled
+from ._reports import ReportWriter
 
+logger = logging.getLogger("ebs_cleanup")
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+# EC2 accepts at most 200 values per filter
+SNAPSHOT_ID_FILTER_BATCH = 200
 
 
-def volume_has_required_tag(volume: dict, required_tag: dict) -> bool:
+def volume_has_required_tag(volume: dict, required_tag: Optional[dict]) -> bool:
     if not required_tag:
         return True
     
-    tags = {tag["Key"]: tag["Value"] for tag in volume.get("Tags", [])}
     key = required_tag["key"]
     value = required_tag.get("value")
     
-    if key not in tags:
-        return False
-    if value is not None and tags.get(key) != value:
-        return False
-    return True
+    # Tag keys are unique per resource, so stop at the first match
+    for tag in volume.get("Tags", []):
+        if tag["Key"] == key:
+            return value is None or tag["Value"] == value
+    return False
 
 
-def should_target_volume(volume: dict, config: dict, now: datetime) -> bool:
+def should_target_volume(volume: dict, config: dict, cutoff: datetime) -> bool:
     volume_id = volume["VolumeId"]
     state = volume["State"]
-    create_time = ensure_tz(volume["CreateTime"])
+    create_time = volume["CreateTime"]
     size = volume["Size"]
     
     # Check target/ignore lists
@@ -44,7 +50,6 @@ def should_target_volume(volume: dict, config: dict, now: datetime) -> bool:
         return False
     
     # Check age
-    cutoff = now - timedelta(days=config.get("volume_retention_days", 7))
     if create_time > cutoff:
         logger.debug("Skipping %s: volume age below retention", volume_id)
         return False
@@ -62,16 +67,15 @@ def should_target_volume(volume: dict, config: dict, now: datetime) -> bool:
     return True
 
 
-def should_target_snapshot(snapshot: dict, config: dict, now: datetime) -> bool:
+def should_target_snapshot(snapshot: dict, config: dict, cutoff: datetime) -> bool:
     snapshot_id = snapshot["SnapshotId"]
-    start_time = ensure_tz(snapshot["StartTime"])
+    start_time = snapshot["StartTime"]
     
     # Check target list
     if config.get("target_snapshots") and snapshot_id not in config["target_snapshots"]:
         return False
     
     # Check age
-    cutoff = now - timedelta(days=config.get("snapshot_retention_days", 30))
     if start_time > cutoff:
         logger.debug("Skipping %s: snapshot age below retention", snapshot_id)
         return False
@@ -89,6 +93,8 @@ def delete_volume(ec2_client, volume_id: str, dry_run: bool) -> bool:
         logger.info("Deleted volume %s", volume_id)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not delete volume %s: %s", volume_id, exc)
         return False
 
@@ -103,10 +109,99 @@ def delete_snapshot(ec2_client, snapshot_id: str, dry_run: bool) -> bool:
         logger.info("Deleted snapshot %s", snapshot_id)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not delete snapshot %s: %s", snapshot_id, exc)
         return False
 
 
+def _normalize_config(config: dict) -> dict:
+    """Copy ``config`` with its ID and state lists frozen into sets for O(1) membership checks."""
+    cfg = dict(config)
+    for key in ("ignore_volumes", "target_snapshots"):
+        cfg[key] = frozenset(config.get(key) or ())
+    cfg["target_states"] = frozenset(config.get("target_states", ["available"]))
+    return cfg
+
+
+def _process_volume(
+    ec2_client,
+    volume: dict,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Tuple[str, bool, dict]:
+    """Delete a targeted volume; safe to run from a worker thread."""
+    volume_id = volume["VolumeId"]
+    logger.info("Processing volume %s", volume_id)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": volume_id,
+                "resource_type": "volume",
+                "status": "planned",
+                "deleted": 0,
+            }
+        )
+
+    deleted = delete_volume(ec2_client, volume_id, dry_run)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": volume_id,
+                "resource_type": "volume",
+                "status": "completed",
+                "deleted": 1 if not dry_run else 0,
+            }
+        )
+
+    return volume_id, deleted, {
+        "volume_id": volume_id,
+        "state": volume["State"],
+        "size": volume["Size"],
+    }
+
+
+def _process_snapshot(
+    ec2_client,
+    snapshot: dict,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Tuple[str, bool, dict]:
+    """Delete a targeted snapshot; safe to run from a worker thread."""
+    snapshot_id = snapshot["SnapshotId"]
+    logger.info("Processing snapshot %s", snapshot_id)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": snapshot_id,
+                "resource_type": "snapshot",
+                "status": "planned",
+                "deleted": 0,
+            }
+        )
+
+    deleted = delete_snapshot(ec2_client, snapshot_id, dry_run)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": snapshot_id,
+                "resource_type": "snapshot",
+                "status": "completed",
+                "deleted": 1 if not dry_run else 0,
+            }
+        )
+
+    return snapshot_id, deleted, {
+        "snapshot_id": snapshot_id,
+        "state": snapshot["State"],
+        "volume_size": snapshot["VolumeSize"],
+    }
+
+
 def run_ebs_cleanup(
     config: dict,
     *,
@@ -115,103 +210,95 @@ def run_ebs_cleanup(
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> dict:
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.get("region_name"))
-    ec2_client = sess.client("ec2", region_name=config.get("region_name"))
-    
-    # Get volumes
-    volumes = []
-    volumes_paginator = ec2_client.get_paginator("describe_volumes")
-    for page in volumes_paginator.paginate():
-        volumes.extend(page.get("Volumes", []))
-    
-    # Get snapshots (only owned by this account)
-    snapshots = []
-    snapshots_paginator = ec2_client.get_paginator("describe_snapshots")
-    for page in snapshots_paginator.paginate(OwnerIds=["self"]):
-        snapshots.extend(page.get("Snapshots", []))
+    cfg = _normalize_config(config)
+    volume_cutoff = now - timedelta(days=config.get("volume_retention_days", 7))
+    snapshot_cutoff = now - timedelta(days=config.get("snapshot_retention_days", 30))
+    max_workers = config.get("max_workers", 16)
+    # boto3 low-level clients are thread-safe, so one client is shared by every worker.
+    ec2_client = make_client("ec2", config.get("region_name"), session=session, max_pool_connections=max_workers)
     
     summary = {
         "dry_run": dry_run,
-        "volumes_scanned": len(volumes),
-        "snapshots_scanned": len(snapshots),
+        "volumes_scanned": 0,
+        "snapshots_scanned": 0,
         "volumes_deleted": 0,
         "snapshots_deleted": 0,
         "volume_reports": [],
         "snapshot_reports": [],
     }
-    
-    # Process volumes
-    for volume in volumes:
-        if not should_target_volume(volume, config, now):
-            continue
-        
-        volume_id = volume["VolumeId"]
-        logger.info("Processing volume %s", volume_id)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": volume_id,
-                    "resource_type": "volume",
-                    "status": "planned",
-                    "deleted": 0,
-                }
-            )
-        
-        if delete_volume(ec2_client, volume_id, dry_run):
-            summary["volumes_deleted"] += 1
-
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": volume_id,
-                    "resource_type": "volume",
-                    "status": "completed",
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
-        
-        summary["volume_reports"].append({
-            "volume_id": volume_id,
-            "state": volume["State"],
-            "size": volume["Size"],
-        })
-    
-    # Process snapshots
-    for snapshot in snapshots:
-        if not should_target_snapshot(snapshot, config, now):
-            continue
-        
-        snapshot_id = snapshot["SnapshotId"]
-        logger.info("Processing snapshot %s", snapshot_id)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": snapshot_id,
-                    "resource_type": "snapshot",
-                    "status": "planned",
-                    "deleted": 0,
-                }
-            )
-        
-        if delete_snapshot(ec2_client, snapshot_id, dry_run):
-            summary["snapshots_deleted"] += 1
-        
-        summary["snapshot_reports"].append({
-            "snapshot_id": snapshot_id,
-            "state": snapshot["State"],
-            "volume_size": snapshot["VolumeSize"],
-        })
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": snapshot_id,
-                    "resource_type": "snapshot",
-                    "status": "completed",
-                    "deleted": 1 if not dry_run else 0,
-                }
+
+    # Get volumes; EC2 applies the state and tag filters server-side so only candidates are returned
+    volumes: Iterable[dict] = ()
+    if cfg["target_states"]:
+        volumes_paginator = ec2_client.get_paginator("describe_volumes")
+        volume_filters = [{"Name": "status", "Values": sorted(cfg["target_states"])}]
+        volume_filters += ec2_tag_filters(config.get("require_tag"))
+        volume_pages = volumes_paginator.paginate(Filters=volume_filters, PaginationConfig={"PageSize": 500})
+        volumes = chain.from_iterable(page.get("Volumes", []) for page in volume_pages)
+
+    # Get snapshots (only owned by this account)
+    snapshots_paginator = ec2_client.get_paginator("describe_snapshots")
+    if cfg["target_snapshots"]:
+        # Only fetch the listed snapshots; a filter, unlike SnapshotIds, tolerates IDs that no longer exist
+        target_ids = sorted(cfg["target_snapshots"])
+        snapshot_pages = chain.from_iterable(
+            snapshots_paginator.paginate(
+                OwnerIds=["self"],
+                Filters=[{"Name": "snapshot-id", "Values": target_ids[idx : idx + SNAPSHOT_ID_FILTER_BATCH]}],
+                PaginationConfig={"PageSize": 1000},
             )
+            for idx in range(0, len(target_ids), SNAPSHOT_ID_FILTER_BATCH)
+        )
+    else:
+        snapshot_pages = snapshots_paginator.paginate(OwnerIds=["self"], PaginationConfig={"PageSize": 1000})
+    snapshots = chain.from_iterable(page.get("Snapshots", []) for page in snapshot_pages)
+
+    def targeted_volumes() -> Iterator[dict]:
+        for volume in volumes:
+            summary["volumes_scanned"] += 1
+            if should_target_volume(volume, cfg, volume_cutoff):
+                yield volume
+
+    def targeted_snapshots() -> Iterator[dict]:
+        for snapshot in snapshots:
+            summary["snapshots_scanned"] += 1
+            if should_target_snapshot(snapshot, cfg, snapshot_cutoff):
+                yield snapshot
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    callback = locked_callback if progress_callback else None
+
+    # Pages are consumed as they arrive, so deletions start before listing finishes.
+    with ReportWriter(summary, config) as reports, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Process volumes
+        process_volume = partial(_process_volume, ec2_client, dry_run=dry_run, progress_callback=callback)
+        volume_results = map_until_throttled(
+            executor, process_volume, targeted_volumes(), itemgetter("VolumeId"), summary
+        )
+        for _, deleted, report in volume_results:
+            if deleted:
+                summary["volumes_deleted"] += 1
+            reports.add("volume_reports", report)
+
+        # Process snapshots, unless the volume pass was throttled: the account is rate limited, so the
+        # remaining candidates are only listed and reported as unprocessed
+        if "throttled" in summary:
+            skipped = [snapshot["SnapshotId"] for snapshot in targeted_snapshots()]
+            summary["throttled"].extend(skipped)  # type: ignore[attr-defined]
+            return summary
+        process_snapshot = partial(_process_snapshot, ec2_client, dry_run=dry_run, progress_callback=callback)
+        snapshot_results = map_until_throttled(
+            executor, process_snapshot, targeted_snapshots(), itemgetter("SnapshotId"), summary
+        )
+        for _, deleted, report in snapshot_results:
+            if deleted:
+                summary["snapshots_deleted"] += 1
+            reports.add("snapshot_reports", report)
     
     return summary
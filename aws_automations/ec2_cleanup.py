@@ -1,45 +1,45 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from functools import partial
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import boto3
 from botocore.exceptions import ClientError
 
-logger = logging.getLogger("ec2_cleanup")
-
+from ._boto import ec2_tag_filters, is_throttling_error, make_client, map_until_throttled
+from ._patterns import matches_patterns
+from ._reports import ReportWriter
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+logger = logging.getLogger("ec2_cleanup")
 
 
 def instance_matches_patterns(name: str, patterns: List[str]) -> bool:
-    if not patterns:
-        return True
-    import fnmatch
-    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    return matches_patterns(name, patterns)
 
 
-def instance_has_required_tag(instance: dict, required_tag: dict) -> bool:
+def instance_has_required_tag(instance: dict, required_tag: Optional[dict]) -> bool:
     if not required_tag:
         return True
     
-    tags = {tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])}
     key = required_tag["key"]
     value = required_tag.get("value")
     
-    if key not in tags:
-        return False
-    if value is not None and tags.get(key) != value:
-        return False
-    return True
+    # Tag keys are unique per resource, so stop at the first match
+    for tag in instance.get("Tags", []):
+        if tag["Key"] == key:
+            return value is None or tag["Value"] == value
+    return False
 
 
-def should_target_instance(instance: dict, config: dict, now: datetime) -> bool:
+def should_target_instance(instance: dict, config: dict, cutoff: datetime) -> bool:
     instance_id = instance["InstanceId"]
     state = instance["State"]["Name"]
-    launch_time = ensure_tz(instance["LaunchTime"])
+    launch_time = instance["LaunchTime"]
     
     # Check target/ignore lists
     if config.get("target_instances") and instance_id not in config["target_instances"]:
@@ -52,7 +52,6 @@ def should_target_instance(instance: dict, config: dict, now: datetime) -> bool:
         return False
     
     # Check age
-    cutoff = now - timedelta(days=config.get("instance_retention_days", 7))
     if launch_time > cutoff:
         logger.debug("Skipping %s: instance age below retention", instance_id)
         return False
@@ -69,19 +68,31 @@ def should_target_instance(instance: dict, config: dict, now: datetime) -> bool:
     return True
 
 
-def collect_instance_volumes(ec2_client, instance_id: str) -> List[str]:
-    try:
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
-        volumes = []
-        for reservation in response["Reservations"]:
-            for instance in reservation["Instances"]:
-                for bdm in instance.get("BlockDeviceMappings", []):
-                    if "Ebs" in bdm:
-                        volumes.append(bdm["Ebs"]["VolumeId"])
-        return volumes
-    except ClientError as exc:
-        logger.warning("Could not get volumes for %s: %s", instance_id, exc)
-        return []
+def iter_instances(ec2_client, filters: Optional[List[dict]] = None) -> Iterator[dict]:
+    paginator = ec2_client.get_paginator("describe_instances")
+    for page in paginator.paginate(Filters=filters or [], PaginationConfig={"PageSize": 1000}):
+        for reservation in page.get("Reservations", []):
+            yield from reservation.get("Instances", [])
+
+
+def instance_volume_ids(instance: dict) -> List[str]:
+    return [bdm["Ebs"]["VolumeId"] for bdm in instance.get("BlockDeviceMappings", []) if "Ebs" in bdm]
+
+
+def collect_instance_volumes(ec2_client, instance_ids: List[str]) -> Dict[str, List[str]]:
+    """Map instance IDs to their EBS volume IDs, batching lookups by the API maximum of 100 IDs."""
+    volumes: Dict[str, List[str]] = {}
+    paginator = ec2_client.get_paginator("describe_instances")
+    for idx in range(0, len(instance_ids), 100):
+        batch = instance_ids[idx : idx + 100]
+        try:
+            for page in paginator.paginate(InstanceIds=batch):
+                for reservation in page.get("Reservations", []):
+                    for instance in reservation.get("Instances", []):
+                        volumes[instance["InstanceId"]] = instance_volume_ids(instance)
+        except ClientError as exc:
+            logger.warning("Could not get volumes for %s: %s", ", ".join(batch), exc)
+    return volumes
 
 
 def terminate_instance(ec2_client, instance_id: str, dry_run: bool) -> bool:
@@ -94,6 +105,8 @@ def terminate_instance(ec2_client, instance_id: str, dry_run: bool) -> bool:
         logger.info("Terminated instance %s", instance_id)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not terminate instance %s: %s", instance_id, exc)
         return False
 
@@ -108,10 +121,77 @@ def delete_volume(ec2_client, volume_id: str, dry_run: bool) -> bool:
         logger.info("Deleted volume %s", volume_id)
         return True
     except ClientError as exc:
+        if is_throttling_error(exc):
+            raise
         logger.warning("Could not delete volume %s: %s", volume_id, exc)
         return False
 
 
+def _normalize_config(config: dict) -> dict:
+    """Copy ``config`` with its ID and state lists frozen into sets for O(1) membership checks."""
+    cfg = dict(config)
+    for key in ("target_instances", "ignore_instances"):
+        cfg[key] = frozenset(config.get(key) or ())
+    cfg["target_states"] = frozenset(config.get("target_states", ["stopped"]))
+    cfg["name_patterns"] = tuple(config.get("name_patterns") or ())
+    return cfg
+
+
+def _process_instance(
+    ec2_client,
+    instance: dict,
+    config: dict,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> dict:
+    """Terminate a targeted instance and its volumes; safe to run from a worker thread."""
+    instance_id = instance["InstanceId"]
+    logger.info("Processing instance %s", instance_id)
+    result: Dict[str, Any] = {"terminated": False, "volumes_deleted": 0}
+
+    volumes = []
+    if config.get("delete_volumes", True):
+        # describe_instances already returned the block device mappings; no second lookup needed.
+        volumes = instance_volume_ids(instance)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": instance_id,
+                "resource_type": "instance",
+                "status": "planned",
+                "volumes": len(volumes),
+                "deleted": 0,
+            }
+        )
+
+    if terminate_instance(ec2_client, instance_id, dry_run):
+        result["terminated"] = True
+
+        # Delete associated volumes if configured
+        for volume_id in volumes:
+            if delete_volume(ec2_client, volume_id, dry_run):
+                result["volumes_deleted"] += 1
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": instance_id,
+                "resource_type": "instance",
+                "status": "completed",
+                "volumes": len(volumes),
+                "deleted": 1 if not dry_run else 0,
+            }
+        )
+
+    result["report"] = {
+        "instance_id": instance_id,
+        "state": instance["State"]["Name"],
+        "volumes": volumes,
+    }
+    return result
+
+
 def run_ec2_cleanup(
     config: dict,
     *,
@@ -120,68 +200,52 @@ def run_ec2_cleanup(
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> dict:
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.get("region_name"))
-    ec2_client = sess.client("ec2", region_name=config.get("region_name"))
-    
-    paginator = ec2_client.get_paginator("describe_instances")
-    instances = []
-    for page in paginator.paginate():
-        for reservation in page.get("Reservations", []):
-            instances.extend(reservation.get("Instances", []))
+    cfg = _normalize_config(config)
+    cutoff = now - timedelta(days=config.get("instance_retention_days", 7))
+    max_workers = config.get("max_workers", 16)
+    # boto3 low-level clients are thread-safe, so one client is shared by every worker.
+    ec2_client = make_client("ec2", config.get("region_name"), session=session, max_pool_connections=max_workers)
     
     summary = {
         "dry_run": dry_run,
-        "instances_scanned": len(instances),
+        "instances_scanned": 0,
         "instances_terminated": 0,
         "volumes_deleted": 0,
         "instance_reports": [],
     }
-    
-    for instance in instances:
-        if not should_target_instance(instance, config, now):
-            continue
-        
-        instance_id = instance["InstanceId"]
-        logger.info("Processing instance %s", instance_id)
-        
-        volumes = []
-        if config.get("delete_volumes", True):
-            volumes = collect_instance_volumes(ec2_client, instance_id)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": instance_id,
-                    "resource_type": "instance",
-                    "status": "planned",
-                    "volumes": len(volumes),
-                    "deleted": 0,
-                }
-            )
-        
-        if terminate_instance(ec2_client, instance_id, dry_run):
-            summary["instances_terminated"] += 1
-            
-            # Delete associated volumes if configured
-            for volume_id in volumes:
-                if delete_volume(ec2_client, volume_id, dry_run):
-                    summary["volumes_deleted"] += 1
-
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": instance_id,
-                    "resource_type": "instance",
-                    "status": "completed",
-                    "volumes": len(volumes),
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
-        
-        summary["instance_reports"].append({
-            "instance_id": instance_id,
-            "state": instance["State"]["Name"],
-            "volumes": volumes,
-        })
+
+    # EC2 applies the state and tag filters server-side so only candidates are returned
+    filters = [{"Name": "instance-state-name", "Values": sorted(cfg["target_states"])}]
+    filters += ec2_tag_filters(config.get("require_tag"))
+
+    def targeted_instances() -> Iterator[dict]:
+        if not cfg["target_states"]:
+            return
+        for instance in iter_instances(ec2_client, filters):
+            summary["instances_scanned"] += 1
+            if should_target_instance(instance, cfg, cutoff):
+                yield instance
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    process = partial(
+        _process_instance,
+        ec2_client,
+        config=cfg,
+        dry_run=dry_run,
+        progress_callback=locked_callback if progress_callback else None,
+    )
+    with ReportWriter(summary, config) as reports, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = map_until_throttled(executor, process, targeted_instances(), itemgetter("InstanceId"), summary)
+        for result in results:
+            if result["terminated"]:
+                summary["instances_terminated"] += 1
+            summary["volumes_deleted"] += result["volumes_deleted"]
+            reports.add("instance_reports", result["report"])
     
     return summary
@@ -1,37 +1,50 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 
+from ._boto import make_client
+from ._patterns import matches_patterns
+from ._reports import ReportWriter
+from ._time import ensure_tz
+
 logger = logging.getLogger("iam_cleanup")
 
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+def resource_matches_patterns(name: str, patterns: List[str]) -> bool:
+    return matches_patterns(name, patterns)
 
 
-def resource_matches_patterns(name: str, patterns: List[str]) -> bool:
-    if not patterns:
-        return True
-    import fnmatch
-    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+def role_last_activity(role: dict) -> datetime:
+    # Check RoleLastUsed if available
+    if "RoleLastUsed" in role and "LastUsedDate" in role["RoleLastUsed"]:
+        return ensure_tz(role["RoleLastUsed"]["LastUsedDate"])
+    
+    # Fall back to creation date
+    return ensure_tz(role["CreateDate"])
+
+
+def user_last_activity(user: dict) -> datetime:
+    # Check password last used
+    if "PasswordLastUsed" in user:
+        return ensure_tz(user["PasswordLastUsed"])
+    
+    # Fall back to creation date
+    return ensure_tz(user["CreateDate"])
 
 
 def get_role_last_activity(iam_client, role_name: str) -> Optional[datetime]:
     try:
         response = iam_client.get_role(RoleName=role_name)
-        role = response["Role"]
-        
-        # Check RoleLastUsed if available
-        if "RoleLastUsed" in role and "LastUsedDate" in role["RoleLastUsed"]:
-            return ensure_tz(role["RoleLastUsed"]["LastUsedDate"])
-        
-        # Fall back to creation date
-        return ensure_tz(role["CreateDate"])
+        return role_last_activity(response["Role"])
     except ClientError:
         return None
 
@@ -39,23 +52,112 @@ def get_role_last_activity(iam_client, role_name: str) -> Optional[datetime]:
 def get_user_last_activity(iam_client, user_name: str) -> Optional[datetime]:
     try:
         response = iam_client.get_user(UserName=user_name)
-        user = response["User"]
-        
-        # Check password last used
-        if "PasswordLastUsed" in user:
-            return ensure_tz(user["PasswordLastUsed"])
-        
-        # Fall back to creation date
-        return ensure_tz(user["CreateDate"])
+        return user_last_activity(response["User"])
     except ClientError:
         return None
 
 
-def should_target_role(role: dict, config: dict, now: datetime, iam_client) -> bool:
+def get_service_last_accessed(
+    iam_client, arn: str, poll_interval: float = 1.0, max_wait: float = 60.0
+) -> Optional[datetime]:
+    """Return the last time ``arn`` authenticated to any AWS service, from a service-last-accessed report.
+
+    This also covers permission use that ``RoleLastUsed`` and ``PasswordLastUsed`` miss, at the
+    cost of an asynchronous IAM job per entity. Returns None if the job fails or times out.
+    """
+    try:
+        job_id = iam_client.generate_service_last_accessed_details(Arn=arn)["JobId"]
+        deadline = time.monotonic() + max_wait
+        delay = poll_interval
+        kwargs: Dict[str, Any] = {"JobId": job_id}
+        last_accessed: Optional[datetime] = None
+        while True:
+            response = iam_client.get_service_last_accessed_details(**kwargs)
+            status = response["JobStatus"]
+            if status == "IN_PROGRESS":
+                if time.monotonic() + delay > deadline:
+                    logger.warning("Timed out waiting for service last accessed report of %s", arn)
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                continue
+            if status != "COMPLETED":
+                logger.warning("Service last accessed report failed for %s: %s", arn, response.get("Error"))
+                return None
+
+            for service in response.get("ServicesLastAccessed", []):
+                if "LastAuthenticated" in service:
+                    accessed = ensure_tz(service["LastAuthenticated"])
+                    if last_accessed is None or accessed > last_accessed:
+                        last_accessed = accessed
+            if not response.get("IsTruncated"):
+                return last_accessed
+            kwargs["Marker"] = response["Marker"]
+    except ClientError as exc:
+        logger.warning("Could not get service last accessed report for %s: %s", arn, exc)
+        return None
+
+
+def iter_authorization_details(iam_client) -> Iterator[Tuple[str, dict]]:
+    """Yield ``("role" | "user" | "policy", record)`` pairs, with attachments, page by page.
+
+    ``GetAccountAuthorizationDetails`` omits ``PasswordLastUsed``, so it is merged into the
+    user records from ``list_users``, which is still far cheaper than one ``get_user`` per user.
+    """
+    password_last_used = {}
+    for page in iam_client.get_paginator("list_users").paginate():
+        for user in page.get("Users", []):
+            if "PasswordLastUsed" in user:
+                password_last_used[user["UserName"]] = user["PasswordLastUsed"]
+
+    paginator = iam_client.get_paginator("get_account_authorization_details")
+    for page in paginator.paginate(Filter=["Role", "User", "LocalManagedPolicy"]):
+        for role in page.get("RoleDetailList", []):
+            yield "role", role
+        for user in page.get("UserDetailList", []):
+            if user["UserName"] in password_last_used:
+                user["PasswordLastUsed"] = password_last_used[user["UserName"]]
+            yield "user", user
+        for policy in page.get("Policies", []):
+            yield "policy", policy
+
+
+# Service-linked and IAM Identity Center roles are owned by AWS and cannot be cleaned up
+AWS_MANAGED_ROLE_PATHS = ("/aws-service-role/", "/aws-reserved/")
+AWS_MANAGED_POLICY_PREFIX = "arn:aws:iam::aws:"
+
+
+def is_aws_managed(resource_type: str, resource: dict) -> bool:
+    """True for AWS-owned roles and policies, which are never cleanup candidates."""
+    if resource_type == "role":
+        path: str = resource["Path"]
+        return path.startswith(AWS_MANAGED_ROLE_PATHS)
+    if resource_type == "policy":
+        arn: str = resource["Arn"]
+        return arn.startswith(AWS_MANAGED_POLICY_PREFIX)
+    return False
+
+
+ActivityLookup = Callable[[str], Optional[datetime]]
+# Deletes a resource by name (ARN for policies), given its prefetched record
+Remover = Callable[[str, Optional[dict]], bool]
+
+
+def should_target_role(
+    role: dict,
+    config: dict,
+    cutoff: datetime,
+    iam_client,
+    lookup_activity: Optional[ActivityLookup] = None,
+) -> bool:
+    """Check a role against filters and activity.
+
+    ``lookup_activity`` replaces :func:`get_role_last_activity` for bare records without ``CreateDate``.
+    """
     role_name = role["RoleName"]
     
     # Skip AWS service roles
-    if role["Path"].startswith("/aws-service-role/"):
+    if is_aws_managed("role", role):
         return False
     
     # Check ignore list
@@ -66,20 +168,32 @@ def should_target_role(role: dict, config: dict, now: datetime, iam_client) -> b
     if not resource_matches_patterns(role_name, config.get("name_patterns", [])):
         return False
     
-    # Check last activity
-    retention_days = config.get("role_retention_days", 30)
-    last_activity = get_role_last_activity(iam_client, role_name)
+    # Check last activity; listed roles carry CreateDate, and RoleLastUsed once they have been used
+    if "CreateDate" in role:
+        last_activity: Optional[datetime] = role_last_activity(role)
+    elif lookup_activity is not None:
+        last_activity = lookup_activity(role_name)
+    else:
+        last_activity = get_role_last_activity(iam_client, role_name)
     
-    if last_activity:
-        cutoff = now - timedelta(days=retention_days)
-        if last_activity > cutoff:
-            logger.debug("Skipping %s: recent activity", role_name)
-            return False
+    if last_activity and last_activity > cutoff:
+        logger.debug("Skipping %s: recent activity", role_name)
+        return False
     
     return True
 
 
-def should_target_user(user: dict, config: dict, now: datetime, iam_client) -> bool:
+def should_target_user(
+    user: dict,
+    config: dict,
+    cutoff: datetime,
+    iam_client,
+    lookup_activity: Optional[ActivityLookup] = None,
+) -> bool:
+    """Check a user against filters and activity.
+
+    ``lookup_activity`` replaces :func:`get_user_last_activity` for records without ``CreateDate``.
+    """
     user_name = user["UserName"]
     
     # Check ignore list
@@ -90,24 +204,26 @@ def should_target_user(user: dict, config: dict, now: datetime, iam_client) -> b
     if not resource_matches_patterns(user_name, config.get("name_patterns", [])):
         return False
     
-    # Check last activity
-    retention_days = config.get("user_retention_days", 30)
-    last_activity = get_user_last_activity(iam_client, user_name)
+    # Check last activity; listed users already carry PasswordLastUsed and CreateDate
+    if "CreateDate" in user:
+        last_activity: Optional[datetime] = user_last_activity(user)
+    elif lookup_activity is not None:
+        last_activity = lookup_activity(user_name)
+    else:
+        last_activity = get_user_last_activity(iam_client, user_name)
     
-    if last_activity:
-        cutoff = now - timedelta(days=retention_days)
-        if last_activity > cutoff:
-            logger.debug("Skipping %s: recent activity", user_name)
-            return False
+    if last_activity and last_activity > cutoff:
+        logger.debug("Skipping %s: recent activity", user_name)
+        return False
     
     return True
 
 
-def should_target_policy(policy: dict, config: dict, now: datetime) -> bool:
+def should_target_policy(policy: dict, config: dict, cutoff: datetime) -> bool:
     policy_name = policy["PolicyName"]
     
     # Skip AWS managed policies
-    if policy["Arn"].startswith("arn:aws:iam::aws:"):
+    if is_aws_managed("policy", policy):
         return False
     
     # Check ignore list
@@ -119,38 +235,51 @@ def should_target_policy(policy: dict, config: dict, now: datetime) -> bool:
         return False
     
     # Check age
-    retention_days = config.get("policy_retention_days", 30)
-    create_date = ensure_tz(policy["CreateDate"])
-    cutoff = now - timedelta(days=retention_days)
-    
-    if create_date > cutoff:
+    if ensure_tz(policy["CreateDate"]) > cutoff:
         logger.debug("Skipping %s: policy age below retention", policy_name)
         return False
     
     return True
 
 
-def delete_role(iam_client, role_name: str, dry_run: bool) -> bool:
+def _log_dry_run(resource_type: str, resource_id: str, record: Optional[dict] = None) -> bool:
+    logger.info("Dry run: would delete %s %s", resource_type, resource_id)
+    return False
+
+
+def delete_role(iam_client, role_name: str, dry_run: bool, role: Optional[dict] = None) -> bool:
+    """Delete a role and its attachments, reading them from ``role`` details when prefetched."""
     if dry_run:
-        logger.info("Dry run: would delete role %s", role_name)
-        return False
-    
+        return _log_dry_run("role", role_name)
+    return _remove_role(iam_client, role_name, role)
+
+
+def _remove_role(iam_client, role_name: str, role: Optional[dict] = None) -> bool:
     try:
+        if role is not None and "InstanceProfileList" in role:
+            policy_arns = [policy["PolicyArn"] for policy in role.get("AttachedManagedPolicies", [])]
+            policy_names = [policy["PolicyName"] for policy in role.get("RolePolicyList", [])]
+            profile_names = [profile["InstanceProfileName"] for profile in role["InstanceProfileList"]]
+        else:
+            response = iam_client.list_attached_role_policies(RoleName=role_name)
+            policy_arns = [policy["PolicyArn"] for policy in response.get("AttachedPolicies", [])]
+            response = iam_client.list_role_policies(RoleName=role_name)
+            policy_names = response.get("PolicyNames", [])
+            response = iam_client.list_instance_profiles_for_role(RoleName=role_name)
+            profile_names = [profile["InstanceProfileName"] for profile in response.get("InstanceProfiles", [])]
+
         # Detach managed policies
-        response = iam_client.list_attached_role_policies(RoleName=role_name)
-        for policy in response.get("AttachedPolicies", []):
-            iam_client.detach_role_policy(RoleName=role_name, PolicyArn=policy["PolicyArn"])
+        for policy_arn in policy_arns:
+            iam_client.detach_role_policy(RoleName=role_name, PolicyArn=policy_arn)
         
         # Delete inline policies
-        response = iam_client.list_role_policies(RoleName=role_name)
-        for policy_name in response.get("PolicyNames", []):
+        for policy_name in policy_names:
             iam_client.delete_role_policy(RoleName=role_name, PolicyName=policy_name)
         
         # Delete instance profiles
-        response = iam_client.list_instance_profiles_for_role(RoleName=role_name)
-        for profile in response.get("InstanceProfiles", []):
+        for profile_name in profile_names:
             iam_client.remove_role_from_instance_profile(
-                InstanceProfileName=profile["InstanceProfileName"],
+                InstanceProfileName=profile_name,
                 RoleName=role_name
             )
         
@@ -163,31 +292,43 @@ def delete_role(iam_client, role_name: str, dry_run: bool) -> bool:
         return False
 
 
-def delete_user(iam_client, user_name: str, dry_run: bool) -> bool:
+def delete_user(iam_client, user_name: str, dry_run: bool, user: Optional[dict] = None) -> bool:
+    """Delete a user and its attachments, reading them from ``user`` details when prefetched."""
     if dry_run:
-        logger.info("Dry run: would delete user %s", user_name)
-        return False
-    
+        return _log_dry_run("user", user_name)
+    return _remove_user(iam_client, user_name, user)
+
+
+def _remove_user(iam_client, user_name: str, user: Optional[dict] = None) -> bool:
     try:
         # Delete access keys
         response = iam_client.list_access_keys(UserName=user_name)
         for key in response.get("AccessKeyMetadata", []):
             iam_client.delete_access_key(UserName=user_name, AccessKeyId=key["AccessKeyId"])
+
+        if user is not None and "GroupList" in user:
+            policy_arns = [policy["PolicyArn"] for policy in user.get("AttachedManagedPolicies", [])]
+            policy_names = [policy["PolicyName"] for policy in user.get("UserPolicyList", [])]
+            group_names = list(user["GroupList"])
+        else:
+            response = iam_client.list_attached_user_policies(UserName=user_name)
+            policy_arns = [policy["PolicyArn"] for policy in response.get("AttachedPolicies", [])]
+            response = iam_client.list_user_policies(UserName=user_name)
+            policy_names = response.get("PolicyNames", [])
+            response = iam_client.list_groups_for_user(UserName=user_name)
+            group_names = [group["GroupName"] for group in response.get("Groups", [])]
         
         # Detach managed policies
-        response = iam_client.list_attached_user_policies(UserName=user_name)
-        for policy in response.get("AttachedPolicies", []):
-            iam_client.detach_user_policy(UserName=user_name, PolicyArn=policy["PolicyArn"])
+        for policy_arn in policy_arns:
+            iam_client.detach_user_policy(UserName=user_name, PolicyArn=policy_arn)
         
         # Delete inline policies
-        response = iam_client.list_user_policies(UserName=user_name)
-        for policy_name in response.get("PolicyNames", []):
+        for policy_name in policy_names:
             iam_client.delete_user_policy(UserName=user_name, PolicyName=policy_name)
         
         # Remove from groups
-        response = iam_client.get_groups_for_user(UserName=user_name)
-        for group in response.get("Groups", []):
-            iam_client.remove_user_from_group(GroupName=group["GroupName"], UserName=user_name)
+        for group_name in group_names:
+            iam_client.remove_user_from_group(GroupName=group_name, UserName=user_name)
         
         # Delete login profile if exists
         try:
@@ -204,15 +345,21 @@ def delete_user(iam_client, user_name: str, dry_run: bool) -> bool:
         return False
 
 
-def delete_policy(iam_client, policy_arn: str, dry_run: bool) -> bool:
+def delete_policy(iam_client, policy_arn: str, dry_run: bool, policy: Optional[dict] = None) -> bool:
+    """Delete a policy and its old versions, reading them from ``policy`` details when prefetched."""
     if dry_run:
-        logger.info("Dry run: would delete policy %s", policy_arn)
-        return False
-    
+        return _log_dry_run("policy", policy_arn)
+    return _remove_policy(iam_client, policy_arn, policy)
+
+
+def _remove_policy(iam_client, policy_arn: str, policy: Optional[dict] = None) -> bool:
     try:
         # Delete all policy versions except default
-        response = iam_client.list_policy_versions(PolicyArn=policy_arn)
-        for version in response.get("Versions", []):
+        if policy is not None and "PolicyVersionList" in policy:
+            versions = policy["PolicyVersionList"]
+        else:
+            versions = iam_client.list_policy_versions(PolicyArn=policy_arn).get("Versions", [])
+        for version in versions:
             if not version["IsDefaultVersion"]:
                 iam_client.delete_policy_version(
                     PolicyArn=policy_arn,
@@ -228,6 +375,127 @@ def delete_policy(iam_client, policy_arn: str, dry_run: bool) -> bool:
         return False
 
 
+def _delete_with_progress(
+    resource_type: str,
+    resource_name: str,
+    delete: Callable[[], bool],
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, Any]:
+    logger.info("Processing %s %s", resource_type, resource_name)
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": resource_name,
+                "resource_type": resource_type,
+                "status": "planned",
+                "deleted": 0,
+            }
+        )
+
+    deleted = delete()
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": resource_name,
+                "resource_type": resource_type,
+                "status": "completed",
+                "deleted": 1 if not dry_run else 0,
+            }
+        )
+
+    return {
+        "deleted": deleted,
+        "report": {
+            "resource_type": resource_type,
+            "resource_name": resource_name,
+        },
+    }
+
+
+_NOT_TARGETED: Dict[str, Any] = {"deleted": False, "report": None}
+
+
+def _accessed_services_since(arn: str, cutoff: datetime, lookup_service_access: Optional[ActivityLookup]) -> bool:
+    if lookup_service_access is None:
+        return False
+    last_accessed = lookup_service_access(arn)
+    if last_accessed is not None and last_accessed > cutoff:
+        logger.debug("Skipping %s: recent service access", arn)
+        return True
+    return False
+
+
+def _process_role(
+    iam_client,
+    role: dict,
+    config: dict,
+    cutoff: datetime,
+    remove: Remover,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    lookup_activity: Optional[ActivityLookup] = None,
+    lookup_service_access: Optional[ActivityLookup] = None,
+) -> Dict[str, Any]:
+    """Check and delete a role; safe to run from a worker thread."""
+    if not should_target_role(role, config, cutoff, iam_client, lookup_activity):
+        return _NOT_TARGETED
+    # The service access report is the most expensive check, so it only runs for otherwise targeted roles
+    if _accessed_services_since(role["Arn"], cutoff, lookup_service_access):
+        return _NOT_TARGETED
+    role_name = role["RoleName"]
+    delete = partial(remove, role_name, role)
+    return _delete_with_progress("role", role_name, delete, dry_run, progress_callback)
+
+
+def _process_user(
+    iam_client,
+    user: dict,
+    config: dict,
+    cutoff: datetime,
+    remove: Remover,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    lookup_activity: Optional[ActivityLookup] = None,
+    lookup_service_access: Optional[ActivityLookup] = None,
+) -> Dict[str, Any]:
+    """Check and delete a user; safe to run from a worker thread."""
+    if not should_target_user(user, config, cutoff, iam_client, lookup_activity):
+        return _NOT_TARGETED
+    if _accessed_services_since(user["Arn"], cutoff, lookup_service_access):
+        return _NOT_TARGETED
+    user_name = user["UserName"]
+    delete = partial(remove, user_name, user)
+    return _delete_with_progress("user", user_name, delete, dry_run, progress_callback)
+
+
+def _process_policy(
+    iam_client,
+    policy: dict,
+    config: dict,
+    cutoff: datetime,
+    remove: Remover,
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+) -> Dict[str, Any]:
+    """Check and delete a customer managed policy; safe to run from a worker thread."""
+    if not should_target_policy(policy, config, cutoff):
+        return _NOT_TARGETED
+    delete = partial(remove, policy["Arn"], policy)
+    return _delete_with_progress("policy", policy["PolicyName"], delete, dry_run, progress_callback)
+
+
+def _normalize_config(config: dict) -> dict:
+    """Copy ``config`` with its ignore lists frozen into sets for O(1) membership checks."""
+    cfg = dict(config)
+    for key in ("ignore_roles", "ignore_users", "ignore_policies"):
+        cfg[key] = frozenset(config.get(key) or ())
+    cfg["name_patterns"] = tuple(config.get("name_patterns") or ())
+    return cfg
+
+
 def run_iam_cleanup(
     config: dict,
     *,
@@ -236,144 +504,106 @@ def run_iam_cleanup(
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> dict:
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.get("region_name"))
-    iam_client = sess.client("iam")
-    
-    # Get resources
-    roles_paginator = iam_client.get_paginator("list_roles")
-    users_paginator = iam_client.get_paginator("list_users")
-    policies_paginator = iam_client.get_paginator("list_policies")
-    
-    roles = []
-    for page in roles_paginator.paginate():
-        roles.extend(page.get("Roles", []))
-    
-    users = []
-    for page in users_paginator.paginate():
-        users.extend(page.get("Users", []))
-    
-    policies = []
-    for page in policies_paginator.paginate(Scope="Local"):  # Only customer managed policies
-        policies.extend(page.get("Policies", []))
+    cfg = _normalize_config(config)
+    role_cutoff = now - timedelta(days=config.get("role_retention_days", 30))
+    user_cutoff = now - timedelta(days=config.get("user_retention_days", 30))
+    policy_cutoff = now - timedelta(days=config.get("policy_retention_days", 30))
+    max_workers = config.get("max_workers", 16)
+    # boto3 low-level clients are thread-safe, so one client is shared by every worker.
+    iam_client = make_client("iam", config.get("region_name"), session=session, max_pool_connections=max_workers)
     
     summary = {
         "dry_run": dry_run,
-        "roles_scanned": len(roles),
-        "users_scanned": len(users),
-        "policies_scanned": len(policies),
+        "roles_scanned": 0,
+        "users_scanned": 0,
+        "policies_scanned": 0,
         "roles_deleted": 0,
         "users_deleted": 0,
         "policies_deleted": 0,
         "iam_reports": [],
     }
-    
-    # Process roles
-    for role in roles:
-        if not should_target_role(role, config, now, iam_client):
-            continue
-        
-        role_name = role["RoleName"]
-        logger.info("Processing role %s", role_name)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": role_name,
-                    "resource_type": "role",
-                    "status": "planned",
-                    "deleted": 0,
-                }
-            )
-        
-        if delete_role(iam_client, role_name, dry_run):
-            summary["roles_deleted"] += 1
-        
-        summary["iam_reports"].append({
-            "resource_type": "role",
-            "resource_name": role_name,
-        })
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": role_name,
-                    "resource_type": "role",
-                    "status": "completed",
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
-    
-    # Process users
-    for user in users:
-        if not should_target_user(user, config, now, iam_client):
-            continue
-        
-        user_name = user["UserName"]
-        logger.info("Processing user %s", user_name)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": user_name,
-                    "resource_type": "user",
-                    "status": "planned",
-                    "deleted": 0,
-                }
-            )
-        
-        if delete_user(iam_client, user_name, dry_run):
-            summary["users_deleted"] += 1
-        
-        summary["iam_reports"].append({
-            "resource_type": "user",
-            "resource_name": user_name,
-        })
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": user_name,
-                    "resource_type": "user",
-                    "status": "completed",
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
-    
-    # Process policies
-    for policy in policies:
-        if not should_target_policy(policy, config, now):
-            continue
-        
-        policy_name = policy["PolicyName"]
-        policy_arn = policy["Arn"]
-        logger.info("Processing policy %s", policy_name)
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": policy_name,
-                    "resource_type": "policy",
-                    "status": "planned",
-                    "deleted": 0,
-                }
-            )
-        
-        if delete_policy(iam_client, policy_arn, dry_run):
-            summary["policies_deleted"] += 1
-        
-        summary["iam_reports"].append({
-            "resource_type": "policy",
-            "resource_name": policy_name,
-        })
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": policy_name,
-                    "resource_type": "policy",
-                    "status": "completed",
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    callback = locked_callback if progress_callback else None
+    # Fallback activity lookups are memoized for the run; lru_cache is safe to share between workers.
+    role_activity = lru_cache(maxsize=None)(partial(get_role_last_activity, iam_client))
+    user_activity = lru_cache(maxsize=None)(partial(get_user_last_activity, iam_client))
+    service_access: Optional[ActivityLookup] = None
+    if config.get("check_service_last_accessed"):
+        service_access = partial(get_service_last_accessed, iam_client)
+    # Pick dry-run or real deletes once rather than branching for every resource
+    removers: Dict[str, Remover] = {
+        resource_type: partial(_log_dry_run, resource_type) if dry_run else partial(remove, iam_client)
+        for resource_type, remove in (("role", _remove_role), ("user", _remove_user), ("policy", _remove_policy))
+    }
+    workers = {
+        "role": partial(
+            _process_role,
+            iam_client,
+            config=cfg,
+            cutoff=role_cutoff,
+            remove=removers["role"],
+            lookup_activity=role_activity,
+            lookup_service_access=service_access,
+        ),
+        "user": partial(
+            _process_user,
+            iam_client,
+            config=cfg,
+            cutoff=user_cutoff,
+            remove=removers["user"],
+            lookup_activity=user_activity,
+            lookup_service_access=service_access,
+        ),
+        "policy": partial(
+            _process_policy,
+            iam_client,
+            config=cfg,
+            cutoff=policy_cutoff,
+            remove=removers["policy"],
+        ),
+    }
+    counters = {
+        "role": ("roles_scanned", "roles_deleted"),
+        "user": ("users_scanned", "users_deleted"),
+        "policy": ("policies_scanned", "policies_deleted"),
+    }
+    policies: List[dict] = []
+
+    # Resources come with their attachments, so checks and deletes need no per-resource lookups.
+    def principals() -> Iterator[Tuple[str, dict]]:
+        for resource_type, resource in iter_authorization_details(iam_client):
+            summary[counters[resource_type][0]] += 1
+            # Service roles usually dominate the listing; drop them before they reach a worker
+            if is_aws_managed(resource_type, resource):
+                continue
+            if resource_type == "policy":
+                policies.append(resource)
+            else:
+                yield resource_type, resource
+
+    def policy_items() -> Iterator[Tuple[str, dict]]:
+        for policy in policies:
+            yield "policy", policy
+
+    def process(item: Tuple[str, dict]) -> Tuple[str, Dict[str, Any]]:
+        resource_type, resource = item
+        return resource_type, workers[resource_type](resource, dry_run=dry_run, progress_callback=callback)
+
+    with ReportWriter(summary, config) as reports, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Roles and users are checked as pages arrive. Policies wait for them, since a policy
+        # cannot be deleted while a role or user that is being removed still has it attached.
+        for items in (principals(), policy_items()):
+            for resource_type, result in executor.map(process, items):
+                if result["deleted"]:
+                    summary[counters[resource_type][1]] += 1
+                if result["report"]:
+                    reports.add("iam_reports", result["report"])
     
     return summary
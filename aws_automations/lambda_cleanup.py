@@ -1,24 +1,28 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import boto3
 from botocore.exceptions import ClientError
 
-logger = logging.getLogger("lambda_cleanup")
+from ._boto import make_client
+from ._patterns import matches_patterns
+from ._reports import ReportWriter
+from ._time import ensure_tz
 
+logger = logging.getLogger("lambda_cleanup")
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+# GetMetricData accepts at most 500 queries per request
+METRIC_QUERIES_PER_REQUEST = 500
 
 
 def function_matches_patterns(name: str, patterns: List[str]) -> bool:
-    if not patterns:
-        return True
-    import fnmatch
-    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    return matches_patterns(name, patterns)
 
 
 def function_has_required_tag(lambda_client, function_arn: str, required_tag: dict) -> bool:
@@ -63,7 +67,57 @@ def get_function_last_invocation(cloudwatch_client, function_name: str, days: in
         return None
 
 
-def should_target_function(function: dict, config: dict, now: datetime, lambda_client, cloudwatch_client) -> bool:
+def get_last_invocations(
+    cloudwatch_client, function_names: List[str], days: int, now: datetime
+) -> Dict[str, datetime]:
+    """Return the latest day with invocations for each function, fetched with batched GetMetricData calls.
+
+    Functions without invocations in the window, or whose batch failed, are left out.
+    """
+    last_invocations: Dict[str, datetime] = {}
+    paginator = cloudwatch_client.get_paginator("get_metric_data")
+    for idx in range(0, len(function_names), METRIC_QUERIES_PER_REQUEST):
+        batch = function_names[idx : idx + METRIC_QUERIES_PER_REQUEST]
+        queries = [
+            {
+                "Id": f"m{offset}",
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": "AWS/Lambda",
+                        "MetricName": "Invocations",
+                        "Dimensions": [{"Name": "FunctionName", "Value": function_name}],
+                    },
+                    "Period": 86400,  # 1 day
+                    "Stat": "Sum",
+                },
+            }
+            for offset, function_name in enumerate(batch)
+        ]
+        try:
+            pages = paginator.paginate(
+                MetricDataQueries=queries,
+                StartTime=now - timedelta(days=days),
+                EndTime=now,
+            )
+            for page in pages:
+                for series in page.get("MetricDataResults", []):
+                    if not series.get("Timestamps"):
+                        continue
+                    function_name = batch[int(series["Id"][1:])]
+                    latest = max(series["Timestamps"])
+                    if function_name not in last_invocations or latest > last_invocations[function_name]:
+                        last_invocations[function_name] = latest
+        except ClientError as exc:
+            logger.warning("Could not fetch invocation metrics: %s", exc)
+    return last_invocations
+
+
+def _invoked_since(last_invocation: Optional[datetime], cutoff: datetime) -> bool:
+    return last_invocation is not None and ensure_tz(last_invocation) > cutoff
+
+
+def function_passes_filters(function: dict, config: dict) -> bool:
+    """Check a function against the name filters; makes no API calls."""
     function_name = function["FunctionName"]
     
     # Check target/ignore lists
@@ -73,60 +127,107 @@ def should_target_function(function: dict, config: dict, now: datetime, lambda_c
         return False
     
     # Check name patterns
-    if not function_matches_patterns(function_name, config.get("name_patterns", [])):
+    return function_matches_patterns(function_name, config.get("name_patterns", []))
+
+
+def should_target_function(
+    function: dict,
+    config: dict,
+    cutoff: datetime,
+    lambda_client,
+    cloudwatch_client,
+    last_invocations: Optional[Dict[str, datetime]] = None,
+) -> bool:
+    """Check a function against filters and activity, cheapest checks first.
+
+    ``last_invocations`` from :func:`get_last_invocations` replaces the per-function metric lookup.
+    """
+    function_name = function["FunctionName"]
+    if not function_passes_filters(function, config):
         return False
     
-    # Check last invocation
-    retention_days = config.get("function_retention_days", 30)
-    last_invocation = get_function_last_invocation(cloudwatch_client, function_name, retention_days)
-    
-    if last_invocation:
-        cutoff = now - timedelta(days=retention_days)
-        if ensure_tz(last_invocation) > cutoff:
-            logger.debug("Skipping %s: recent invocation", function_name)
-            return False
+    # Check last invocation when it is already at hand
+    if last_invocations is not None and _invoked_since(last_invocations.get(function_name), cutoff):
+        logger.debug("Skipping %s: recent invocation", function_name)
+        return False
     
+    # One ListTags call, cheaper than a metric query
     if not function_has_required_tag(lambda_client, function.get("FunctionArn", ""), config.get("require_tag")):
         return False
 
+    # Otherwise query the function's metrics last
+    if last_invocations is None:
+        retention_days = config.get("function_retention_days", 30)
+        last_invocation = get_function_last_invocation(cloudwatch_client, function_name, retention_days)
+        if _invoked_since(last_invocation, cutoff):
+            logger.debug("Skipping %s: recent invocation", function_name)
+            return False
+
     return True
 
 
-def delete_function_versions(lambda_client, function_name: str, keep_versions: int, dry_run: bool) -> int:
+def delete_function_version(lambda_client, function_name: str, version: str) -> bool:
     try:
-        response = lambda_client.list_versions_by_function(FunctionName=function_name)
-        versions = [v for v in response["Versions"] if v["Version"] != "$LATEST"]
-        
-        # Sort by version number and keep the latest N
-        versions.sort(key=lambda x: int(x["Version"]), reverse=True)
-        to_delete = versions[keep_versions:]
-        
-        deleted = 0
-        for version in to_delete:
-            if dry_run:
-                logger.info("Dry run: would delete version %s of %s", version["Version"], function_name)
-                deleted += 1
-            else:
-                try:
-                    lambda_client.delete_function(
-                        FunctionName=function_name,
-                        Qualifier=version["Version"]
-                    )
-                    deleted += 1
-                except ClientError as exc:
-                    logger.warning("Could not delete version %s: %s", version["Version"], exc)
-        
-        return deleted
+        lambda_client.delete_function(
+            FunctionName=function_name,
+            Qualifier=version
+        )
+        return True
+    except ClientError as exc:
+        logger.warning("Could not delete version %s: %s", version, exc)
+        return False
+
+
+def delete_function_versions(
+    lambda_client,
+    function_name: str,
+    keep_versions: int,
+    dry_run: bool,
+    delete_executor: Optional[Executor] = None,
+) -> int:
+    """Delete all but the newest ``keep_versions`` published versions of a function.
+
+    Lambda has no batch delete, so versions are fanned out over ``delete_executor`` when one is given.
+    """
+    try:
+        paginator = lambda_client.get_paginator("list_versions_by_function")
+        versions = [
+            version["Version"]
+            for page in paginator.paginate(FunctionName=function_name)
+            for version in page.get("Versions", [])
+            if version["Version"] != "$LATEST"
+        ]
     except ClientError as exc:
         logger.warning("Could not list versions for %s: %s", function_name, exc)
         return 0
+    
+    # Versions come back oldest first, so everything before the newest N goes
+    to_delete = versions[:-keep_versions] if keep_versions > 0 else versions
+    
+    if dry_run:
+        for version in to_delete:
+            logger.info("Dry run: would delete version %s of %s", version, function_name)
+        return len(to_delete)
+
+    delete_version = partial(delete_function_version, lambda_client, function_name)
+    # Single deletes make no concurrent API calls, so keep them off the pool.
+    concurrent = delete_executor is not None and len(to_delete) > 1
+    mapper = delete_executor.map if concurrent else map  # type: ignore[union-attr]
+    return sum(mapper(delete_version, to_delete))
+
+
+def _log_dry_run(resource_type: str, resource_id: str) -> bool:
+    logger.info("Dry run: would delete %s %s", resource_type, resource_id)
+    return False
 
 
 def delete_function(lambda_client, function_name: str, dry_run: bool) -> bool:
     if dry_run:
-        logger.info("Dry run: would delete function %s", function_name)
-        return False
-    
+        return _log_dry_run("function", function_name)
+    return _remove_function(lambda_client, function_name)
+
+
+def _remove_function(lambda_client, function_name: str) -> bool:
     try:
         lambda_client.delete_function(FunctionName=function_name)
         logger.info("Deleted function %s", function_name)
@@ -138,9 +239,11 @@ def delete_function(lambda_client, function_name: str, dry_run: bool) -> bool:
 
 def delete_log_group(logs_client, log_group_name: str, dry_run: bool) -> bool:
     if dry_run:
-        logger.info("Dry run: would delete log group %s", log_group_name)
-        return False
-    
+        return _log_dry_run("log group", log_group_name)
+    return _remove_log_group(logs_client, log_group_name)
+
+
+def _remove_log_group(logs_client, log_group_name: str) -> bool:
     try:
         logs_client.delete_log_group(logGroupName=log_group_name)
         logger.info("Deleted log group %s", log_group_name)
@@ -150,6 +253,91 @@ def delete_log_group(logs_client, log_group_name: str, dry_run: bool) -> bool:
         return False
 
 
+def _process_function(
+    lambda_client,
+    cloudwatch_client,
+    logs_client,
+    function: dict,
+    config: dict,
+    cutoff: datetime,
+    remove_function: Callable[[str], bool],
+    remove_log_group: Callable[[str], bool],
+    dry_run: bool,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    last_invocations: Optional[Dict[str, datetime]] = None,
+    delete_executor: Optional[Executor] = None,
+) -> Dict[str, Any]:
+    """Check and clean up a function; safe to run from a worker thread."""
+    result: Dict[str, Any] = {
+        "function_deleted": False,
+        "versions_deleted": 0,
+        "log_group_deleted": False,
+        "report": None,
+    }
+    function_name = function["FunctionName"]
+
+    if not should_target_function(function, config, cutoff, lambda_client, cloudwatch_client, last_invocations):
+        return result
+
+    logger.info("Processing function %s", function_name)
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": function_name,
+                "resource_type": "function",
+                "status": "planned",
+                "versions_deleted": 0,
+                "deleted": 0,
+            }
+        )
+
+    # Delete old versions first
+    versions_deleted = delete_function_versions(
+        lambda_client, 
+        function_name, 
+        config.get("keep_versions", 3), 
+        dry_run,
+        delete_executor,
+    )
+    result["versions_deleted"] = versions_deleted
+
+    # Delete the function entirely if configured
+    if remove_function(function_name):
+        result["function_deleted"] = True
+
+        # Delete associated log group
+        if config.get("delete_logs", True):
+            log_group_name = f"/aws/lambda/{function_name}"
+            result["log_group_deleted"] = remove_log_group(log_group_name)
+
+    result["report"] = {
+        "function_name": function_name,
+        "versions_deleted": versions_deleted,
+    }
+
+    if progress_callback:
+        progress_callback(
+            {
+                "resource": function_name,
+                "resource_type": "function",
+                "status": "completed",
+                "versions_deleted": versions_deleted,
+                "deleted": 1 if not dry_run else 0,
+            }
+        )
+
+    return result
+
+
+def _normalize_config(config: dict) -> dict:
+    """Copy ``config`` with its function lists frozen into sets for O(1) membership checks."""
+    cfg = dict(config)
+    for key in ("target_functions", "ignore_functions"):
+        cfg[key] = frozenset(config.get(key) or ())
+    cfg["name_patterns"] = tuple(config.get("name_patterns") or ())
+    return cfg
+
+
 def run_lambda_cleanup(
     config: dict,
     *,
@@ -158,76 +346,94 @@ def run_lambda_cleanup(
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
 ) -> dict:
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.get("region_name"))
-    lambda_client = sess.client("lambda", region_name=config.get("region_name"))
-    cloudwatch_client = sess.client("cloudwatch", region_name=config.get("region_name"))
-    logs_client = sess.client("logs", region_name=config.get("region_name"))
-    
-    paginator = lambda_client.get_paginator("list_functions")
-    functions = []
-    for page in paginator.paginate():
-        functions.extend(page.get("Functions", []))
+    cfg = _normalize_config(config)
+    retention_days = config.get("function_retention_days", 30)
+    cutoff = now - timedelta(days=retention_days)
+    region_name = config.get("region_name")
+    max_workers = config.get("max_workers", 16)
+    max_concurrent_deletes = config.get("max_concurrent_deletes", 16)
+    # boto3 low-level clients are thread-safe, so one set of clients is shared by every worker.
+    lambda_client = make_client(
+        "lambda",
+        region_name,
+        session=session,
+        max_pool_connections=max_workers + max_concurrent_deletes,
+    )
+    cloudwatch_client = make_client("cloudwatch", region_name, session=session, max_pool_connections=max_workers)
+    logs_client = make_client("logs", region_name, session=session, max_pool_connections=max_workers)
     
     summary = {
         "dry_run": dry_run,
-        "functions_scanned": len(functions),
+        "functions_scanned": 0,
         "functions_deleted": 0,
         "versions_deleted": 0,
         "log_groups_deleted": 0,
         "function_reports": [],
     }
-    
-    for function in functions:
-        function_name = function["FunctionName"]
-        
-        if not should_target_function(function, config, now, lambda_client, cloudwatch_client):
-            continue
-        
-        logger.info("Processing function %s", function_name)
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": function_name,
-                    "resource_type": "function",
-                    "status": "planned",
-                    "versions_deleted": 0,
-                    "deleted": 0,
-                }
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    last_invocations: Dict[str, datetime] = {}
+
+    def with_metrics(batch: List[dict]) -> List[dict]:
+        names = [function["FunctionName"] for function in batch]
+        last_invocations.update(get_last_invocations(cloudwatch_client, names, retention_days, now))
+        return batch
+
+    # Only functions passing the name filters need metrics. They are fetched for each full
+    # GetMetricData batch of candidates as pages arrive, so workers start before listing finishes.
+    def candidates() -> Iterator[dict]:
+        batch: List[dict] = []
+        # ListFunctions returns at most 50 functions per call; the default $LATEST-only listing is all we need.
+        for page in lambda_client.get_paginator("list_functions").paginate():
+            for function in page.get("Functions", []):
+                summary["functions_scanned"] += 1
+                if function_passes_filters(function, cfg):
+                    batch.append(function)
+            if len(batch) >= METRIC_QUERIES_PER_REQUEST:
+                yield from with_metrics(batch)
+                batch = []
+        if batch:
+            yield from with_metrics(batch)
+
+    # Pick dry-run or real deletes once rather than branching for every function
+    if dry_run:
+        remove_function = partial(_log_dry_run, "function")
+        remove_log_group = partial(_log_dry_run, "log group")
+    else:
+        remove_function = partial(_remove_function, lambda_client)
+        remove_log_group = partial(_remove_log_group, logs_client)
+
+    # Version deletes get their own pool so function workers waiting on them cannot starve it.
+    delete_pool = ThreadPoolExecutor(max_workers=max_concurrent_deletes)
+    with ReportWriter(summary, config) as reports, delete_pool as delete_executor:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            process = partial(
+                _process_function,
+                lambda_client,
+                cloudwatch_client,
+                logs_client,
+                config=cfg,
+                cutoff=cutoff,
+                remove_function=remove_function,
+                remove_log_group=remove_log_group,
+                dry_run=dry_run,
+                progress_callback=locked_callback if progress_callback else None,
+                last_invocations=last_invocations,
+                delete_executor=delete_executor,
             )
-        
-        # Delete old versions first
-        versions_deleted = delete_function_versions(
-            lambda_client, 
-            function_name, 
-            config.get("keep_versions", 3), 
-            dry_run
-        )
-        summary["versions_deleted"] += versions_deleted
-        
-        # Delete the function entirely if configured
-        if delete_function(lambda_client, function_name, dry_run):
-            summary["functions_deleted"] += 1
-            
-            # Delete associated log group
-            if config.get("delete_logs", True):
-                log_group_name = f"/aws/lambda/{function_name}"
-                if delete_log_group(logs_client, log_group_name, dry_run):
+            for result in executor.map(process, candidates()):
+                if result["function_deleted"]:
+                    summary["functions_deleted"] += 1
+                if result["log_group_deleted"]:
                     summary["log_groups_deleted"] += 1
-        
-        summary["function_reports"].append({
-            "function_name": function_name,
-            "versions_deleted": versions_deleted,
-        })
-        
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": function_name,
-                    "resource_type": "function",
-                    "status": "completed",
-                    "versions_deleted": versions_deleted,
-                    "deleted": 1 if not dry_run else 0,
-                }
-            )
+                summary["versions_deleted"] += result["versions_deleted"]
+                if result["report"]:
+                    reports.add("function_reports", result["report"])
     
     return summary
@@ -2,51 +2,68 @@
 from __future__ import annotations
 
 import argparse
-import json
+import copy
 import logging
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import yaml
+import boto3
 from rich import box
-from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.text import Text
 
-from .cloudwatch_cleanup import run_cloudwatch_cleanup
-from .ebs_cleanup import run_ebs_cleanup
-from .ec2_cleanup import run_ec2_cleanup
-from .iam_cleanup import run_iam_cleanup
-from .lambda_cleanup import run_lambda_cleanup
-from .s3_cleanup import (
-    run_cleanup as run_s3_cleanup,
-    render_plan as render_s3_plan,
-    prompt_bucket_selection as prompt_s3_bucket_selection,
-)
+from ._console import CONSOLE
+from ._progress import ProgressReport
+from ._reports import dumps_document, dumps_line
+from .config import read_config_file
 
 logger = logging.getLogger("aws_automations")
 
+SERVICES = ("s3", "ec2", "lambda", "ebs", "cloudwatch", "iam")
+SERVICE_CHOICES = SERVICES + ("all",)
+# Keys that name a service section rather than a legacy top-level S3 setting
+SERVICE_SET = frozenset(SERVICES)
+_NON_S3_TOP_LEVEL_KEYS = SERVICE_SET | {"region_name"}
+
+DEFAULT_LIVE_MAX_ROWS = 1000
+PROGRESS_LOG_INTERVAL = 5.0
+
 
 def load_config(config_path: str) -> dict:
-    """Load configuration from YAML file."""
+    """Load configuration from a YAML, JSON or TOML file (chosen by suffix; YAML uses libyaml when available)."""
     config_file = Path(config_path)
     if not config_file.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with open(config_file) as f:
-        return yaml.safe_load(f) or {}
+    # The parse is cached and shared; copy it since CLI overrides are applied in place
+    return copy.deepcopy(read_config_file(config_file)) or {}
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="AWS Resource Cleanup Automation")
     parser.add_argument("--config", default="config.yaml", help="Path to config file")
     parser.add_argument("--apply", action="store_true", help="Apply deletions (default: dry-run)")
-    parser.add_argument("--service", choices=["s3", "ec2", "lambda", "ebs", "cloudwatch", "iam", "all"], 
+    parser.add_argument("--service", choices=SERVICE_CHOICES, 
                        default="all", help="Service to clean up")
     parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument(
+        "--output",
+        choices=("json", "msgpack"),
+        default="json",
+        help="Encoding for --json/--json-stream results; msgpack needs the msgpack extra and a non-TTY stdout",
+    )
+    parser.add_argument(
+        "--json-stream",
+        action="store_true",
+        help="Output one JSON line per service as soon as it finishes (implies --json)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable debug logging")
     parser.add_argument(
         "--interactive",
@@ -59,6 +76,12 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Show a live table of cleanup progress (default on TTY).",
     )
+    parser.add_argument(
+        "--live-max-rows",
+        type=int,
+        default=DEFAULT_LIVE_MAX_ROWS,
+        help="Switch from the live table to periodic progress logs past this many rows (0 for no limit)",
+    )
     
     # Service-specific overrides
     parser.add_argument("--bucket", action="append", help="S3: Target specific buckets")
@@ -66,7 +89,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--force-zero-retention", action="store_true", help="S3: Allow zero retention with --apply")
     parser.add_argument("--force-delete-all", action="store_true", help="S3: Allow delete-all with --apply")
     
-    return parser.parse_args()
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments (``sys.argv`` when ``argv`` is None)."""
+    return _build_parser().parse_args(argv)
 
 
 def run_s3_with_optional_interactive(
@@ -77,22 +105,34 @@ def run_s3_with_optional_interactive(
     interactive: bool = False,
     json_output: bool = False,
     progress_callback: Callable[[Dict[str, object]], None] | None = None,
+    session: Optional[boto3.Session] = None,
 ) -> dict:
+    from .s3_cleanup import (
+        BucketCache,
+        run_cleanup as run_s3_cleanup,
+        render_plan as render_s3_plan,
+        prompt_bucket_selection as prompt_s3_bucket_selection,
+    )
+
     collect_details = json_output
     if not interactive:
         return run_s3_cleanup(
             s3_config,
             dry_run=dry_run,
             buckets_override=buckets_override,
+            session=session,
             collect_details=collect_details,
             progress_callback=progress_callback,
         )
 
+    bucket_cache = BucketCache()
     plan_summary = run_s3_cleanup(
         s3_config,
         dry_run=True,
         buckets_override=buckets_override,
+        session=session,
         collect_details=True,
+        cache=bucket_cache,
     )
     render_s3_plan(plan_summary, s3_config, json_output=json_output)
 
@@ -112,118 +152,249 @@ def run_s3_with_optional_interactive(
         s3_config,
         dry_run=dry_run,
         buckets_override=approved,
+        session=session,
         collect_details=collect_details,
         progress_callback=progress_callback,
+        cache=bucket_cache,
     )
 
 
+def service_skip_reason(service: str, config: dict, explicit: bool = False) -> Optional[str]:
+    """Return why ``service`` should not run, or None to run it.
+
+    With ``--service all`` a service only runs when the config has settings for it; a service
+    named explicitly runs on defaults. Either way ``enabled: false`` in its section turns it off.
+    """
+    section = config.get(service)
+    if section is None and service == "s3":
+        # Backward compatibility: S3 settings may sit at the top level
+        section = {key: value for key, value in config.items() if key not in _NON_S3_TOP_LEVEL_KEYS}
+    if isinstance(section, dict) and section.get("enabled") is False:
+        return "disabled in config"
+    if not section and not explicit:
+        return "no config section"
+    return None
+
+
+# Settings that leave a service nothing to delete when set to an empty list. Elsewhere an empty
+# list means "no restriction" (name_patterns, target_*), and EBS still scans snapshots without
+# volume states, so only EC2's state filter qualifies.
+_EMPTY_SCOPE_KEYS: Dict[str, Tuple[str, ...]] = {"ec2": ("target_states",)}
+
+
+def service_has_work(service: str, service_config: dict) -> bool:
+    """False when ``service_config`` rules out every resource, so the service need not run at all."""
+    return not any(
+        key in service_config and not service_config[key] for key in _EMPTY_SCOPE_KEYS.get(service, ())
+    )
+
+
+def build_service_configs(config: dict) -> Dict[str, dict]:
+    """Resolve every service's settings once, falling back to the top-level ``region_name``.
+
+    A ``region_name`` set inside a service section wins. S3 settings may still sit at the top
+    level of older configs.
+    """
+    region_name = config.get("region_name")
+    service_configs = {}
+    for service in SERVICES:
+        section = config.get(service)
+        if section is None and service == "s3":
+            section = config
+        section = dict(section or {})
+        if section.get("region_name") is None:
+            section["region_name"] = region_name
+        service_configs[service] = section
+    return service_configs
+
+
+def _apply_s3_overrides(args: argparse.Namespace, config: dict) -> None:
+    """Apply the S3 CLI overrides to ``config["s3"]`` and enforce the ``--apply`` safety switches.
+
+    Top-level S3 settings from older configs are moved into an ``s3`` section first.
+    Raises ValueError when a destructive setting lacks its ``--force-*`` flag.
+    """
+    if "s3" not in config:
+        config["s3"] = {key: value for key, value in config.items() if key not in SERVICE_SET}
+    s3_config = config["s3"] = config["s3"] or {}
+
+    if args.delete_all_objects:
+        s3_config["delete_all_objects"] = True
+    if not args.apply:
+        return
+    if s3_config.get("delete_all_objects") and not args.force_delete_all:
+        raise ValueError("delete_all_objects enabled; use --force-delete-all with --apply")
+    retention = s3_config.get("object_retention_days")
+    if retention is not None and retention <= 0 and not args.force_zero_retention:
+        raise ValueError("object_retention_days is 0; use --force-zero-retention with --apply")
+
+
 def run_service_cleanup(
     service: str,
-    config: dict,
+    service_config: dict,
     dry_run: bool,
     progress_callback: Callable[[Dict[str, object]], None] | None = None,
     *,
     buckets_override: Optional[List[str]] = None,
     interactive: bool = False,
     json_output: bool = False,
+    session: Optional[boto3.Session] = None,
 ) -> dict:
-    """Run cleanup for a specific service."""
-    service_config = config.get(service, {})
-    service_config["region_name"] = config.get("region_name")
-    
+    """Run cleanup for a specific service with its entry from :func:`build_service_configs`.
+
+    Pass one ``session`` for every service so its credentials, endpoint data and clients are reused.
+    Each service module is imported here on first use, so a run only loads the services it cleans.
+    """
     if service == "s3":
-        # Convert flat config to nested for backward compatibility
         from .config import CleanupConfig
-        if "s3" not in config:
-            # Old format - convert to new format
-            s3_config = CleanupConfig.from_dict(config)
-            return run_s3_with_optional_interactive(
-                s3_config,
-                dry_run=dry_run,
-                buckets_override=buckets_override,
-                interactive=interactive,
-                json_output=json_output,
-                progress_callback=progress_callback,
-            )
-        else:
-            # New format
-            s3_config = CleanupConfig.from_dict(service_config)
-            return run_s3_with_optional_interactive(
-                s3_config,
-                dry_run=dry_run,
-                buckets_override=buckets_override,
-                interactive=interactive,
-                json_output=json_output,
-                progress_callback=progress_callback,
-            )
+        return run_s3_with_optional_interactive(
+            CleanupConfig.from_dict(service_config),
+            dry_run=dry_run,
+            buckets_override=buckets_override,
+            interactive=interactive,
+            json_output=json_output,
+            progress_callback=progress_callback,
+            session=session,
+        )
     elif service == "ec2":
-        return run_ec2_cleanup(service_config, dry_run=dry_run, progress_callback=progress_callback)
+        from .ec2_cleanup import run_ec2_cleanup
+        return run_ec2_cleanup(service_config, dry_run=dry_run, session=session, progress_callback=progress_callback)
     elif service == "lambda":
-        return run_lambda_cleanup(service_config, dry_run=dry_run, progress_callback=progress_callback)
+        from .lambda_cleanup import run_lambda_cleanup
+        return run_lambda_cleanup(service_config, dry_run=dry_run, session=session, progress_callback=progress_callback)
     elif service == "ebs":
-        return run_ebs_cleanup(service_config, dry_run=dry_run, progress_callback=progress_callback)
+        from .ebs_cleanup import run_ebs_cleanup
+        return run_ebs_cleanup(service_config, dry_run=dry_run, session=session, progress_callback=progress_callback)
     elif service == "cloudwatch":
-        return run_cloudwatch_cleanup(service_config, dry_run=dry_run, progress_callback=progress_callback)
+        from .cloudwatch_cleanup import run_cloudwatch_cleanup
+        return run_cloudwatch_cleanup(
+            service_config, dry_run=dry_run, session=session, progress_callback=progress_callback
+        )
     elif service == "iam":
-        return run_iam_cleanup(service_config, dry_run=dry_run, progress_callback=progress_callback)
+        from .iam_cleanup import run_iam_cleanup
+        return run_iam_cleanup(service_config, dry_run=dry_run, session=session, progress_callback=progress_callback)
     else:
         raise ValueError(f"Unknown service: {service}")
 
 
-def format_details(report: Dict[str, object]) -> str:
-    parts = []
-    if "objects_planned" in report:
-        parts.append(f"objs {report.get('objects_deleted', 0)}/{report.get('objects_planned', 0)}")
-    if "versions_planned" in report:
-        parts.append(f"vers {report.get('versions_deleted', 0)}/{report.get('versions_planned', 0)}")
-    if "volumes" in report:
-        parts.append(f"vols {report.get('volumes')}")
-    if "streams_deleted" in report:
-        parts.append(f"streams {report.get('streams_deleted')}")
-    if "versions_deleted" in report and "objects_planned" not in report:
-        parts.append(f"vers_del {report.get('versions_deleted')}")
-    if "deleted" in report:
-        parts.append(f"deleted {report.get('deleted')}")
-    return ", ".join(str(p) for p in parts if p is not None) or "-"
-
-
-def render_live_state(state: Dict[str, Dict[str, dict]], *, dry_run: bool) -> Table:
+# (field, formatter) pairs for the live table's Details column; a formatter runs only when its field was reported
+_DETAIL_FIELDS: Tuple[Tuple[str, Callable[[ProgressReport], Optional[str]]], ...] = (
+    ("objects_planned", lambda r: f"objs {r.objects_deleted or 0}/{r.objects_planned}"),
+    ("versions_planned", lambda r: f"vers {r.versions_deleted or 0}/{r.versions_planned}"),
+    ("volumes", lambda r: f"vols {r.volumes}"),
+    ("streams_deleted", lambda r: f"streams {r.streams_deleted}"),
+    # S3 reports fold deleted versions into "vers" above
+    ("versions_deleted", lambda r: None if r.objects_planned is not None else f"vers_del {r.versions_deleted}"),
+    ("deleted", lambda r: f"deleted {r.deleted}"),
+)
+
+
+def format_details(report: Union[ProgressReport, Dict[str, object]]) -> str:
+    if isinstance(report, dict):
+        report = ProgressReport.from_dict(report)
+    parts = [format_field(report) for name, format_field in _DETAIL_FIELDS if getattr(report, name) is not None]
+    return ", ".join(part for part in parts if part is not None) or "-"
+
+
+# (header, add_column keyword arguments) for each column of the live table
+_LIVE_COLUMNS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("Service", {"style": "cyan", "no_wrap": True}),
+    ("Resource", {"style": "magenta"}),
+    ("Type", {"style": "green"}),
+    ("Status", {"style": "yellow"}),
+    ("Details", {}),
+)
+
+
+def render_live_state(state: Dict[str, Dict[str, ProgressReport]], *, dry_run: bool) -> Table:
+    """Build the progress table; rows keep the order services and resources were first reported in."""
     table = Table(title="AWS Cleanup Progress", expand=True, box=box.MINIMAL)
-    table.add_column("Service", style="cyan", no_wrap=True)
-    table.add_column("Resource", style="magenta")
-    table.add_column("Type", style="green")
-    table.add_column("Status", style="yellow")
-    table.add_column("Details")
-
-    for service in sorted(state.keys()):
-        for resource in sorted(state[service].keys()):
-            report = state[service][resource]
+    for header, options in _LIVE_COLUMNS:
+        table.add_column(header, **options)
+
+    for service, resources in state.items():
+        for resource, report in resources.items():
             table.add_row(
                 service,
                 resource,
-                str(report.get("resource_type", "-")),
-                str(report.get("status", "-")),
+                report.resource_type,
+                report.status,
                 format_details(report),
             )
 
-    footer = Text(f"Mode: {'dry-run' if dry_run else 'apply'} | Services tracked: {len(state)}", style="bold")
+    tracked = sum(1 for resources in state.values() if resources)
+    footer = Text(f"Mode: {'dry-run' if dry_run else 'apply'} | Services tracked: {tracked}", style="bold")
     table.caption = footer
     return table
 
 
+class LiveStateView:
+    """Live renderable over the progress ``state``.
+
+    The table is rebuilt only when Live refreshes (``refresh_per_second``), however often
+    progress callbacks fire; ``lock`` must guard every write to ``state``.
+    """
+
+    def __init__(self, state: Dict[str, Dict[str, ProgressReport]], *, dry_run: bool, lock: threading.Lock) -> None:
+        self._state = state
+        self._dry_run = dry_run
+        self._lock = lock
+
+    def __rich__(self) -> Table:
+        with self._lock:
+            return render_live_state(self._state, dry_run=self._dry_run)
+
+
+def write_stdout(data: bytes) -> None:
+    """Write serialized output to stdout, bypassing text encoding when stdout has a binary buffer."""
+    sys.stdout.flush()
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode())
+    else:
+        buffer.write(data)
+        buffer.flush()
+
+
+def default_args(**overrides: object) -> argparse.Namespace:
+    """Return the CLI defaults with ``overrides`` applied, for running cleanups without an argv."""
+    args = _build_parser().parse_args([])
+    for name, value in overrides.items():
+        if not hasattr(args, name):
+            raise TypeError(f"Unknown option: {name}")
+        setattr(args, name, value)
+    return args
+
+
 def main() -> None:
     """Main entry point."""
-    args = parse_args()
+    run(parse_args())
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the cleanup described by parsed CLI ``args``."""
+    if args.json_stream:
+        args.json = True
     
     # Setup logging
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.INFO,
         format="%(levelname)s [%(name)s] %(message)s"
     )
-    console = Console()
+    encode_result, encode_results = dumps_line, dumps_document
+    if args.output == "msgpack":
+        if sys.stdout.isatty():
+            logger.warning("Not writing msgpack to a terminal; using JSON output instead")
+        else:
+            try:
+                import msgpack  # type: ignore[import-untyped]
+            except ImportError:
+                logger.error("--output msgpack requires msgpack: pip install 'aws-automations[msgpack]'")
+                sys.exit(1)
+            encode_result = encode_results = partial(msgpack.packb, default=str)
+        args.json = True
+
     live_enabled = args.live if args.live is not None else (sys.stdout.isatty() and not args.json)
-    state: Dict[str, Dict[str, dict]] = {}
-    live_instance: Live | None = None
     
     try:
         config = load_config(args.config)
@@ -231,93 +402,128 @@ def main() -> None:
         logger.error(e)
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Error loading config: {e}")
+        logger.error("Error loading config: %s", e)
         sys.exit(1)
     
-    # Safety checks for S3
-    if args.service in ["s3", "all"]:
-        s3_config = config.get("s3", config)  # Backward compatibility
-        
-        if args.apply:
-            if args.delete_all_objects or s3_config.get("delete_all_objects"):
-                if not args.force_delete_all:
-                    logger.error("delete_all_objects enabled; use --force-delete-all with --apply")
-                    sys.exit(1)
-            
-            retention = s3_config.get("object_retention_days")
-            if retention is not None and retention <= 0 and not args.force_zero_retention:
-                logger.error("object_retention_days is 0; use --force-zero-retention with --apply")
-                sys.exit(1)
-    
-    # Apply CLI overrides for S3
-    if args.delete_all_objects and "s3" in config:
-        config["s3"]["delete_all_objects"] = True
-    elif args.delete_all_objects:
-        config["delete_all_objects"] = True
+    explicit = args.service != "all"
+    services = []
+    for service in ((args.service,) if explicit else SERVICES):
+        reason = service_skip_reason(service, config, explicit)
+        if reason:
+            logger.info("Skipping %s cleanup: %s", service, reason)
+        else:
+            services.append(service)
+
+    if "s3" in services:
+        try:
+            _apply_s3_overrides(args, config)
+        except ValueError as e:
+            logger.error(e)
+            sys.exit(1)
     
-    # Run cleanup
-    services = ["s3", "ec2", "lambda", "ebs", "cloudwatch", "iam"] if args.service == "all" else [args.service]
-    results = {}
+    # Run cleanup; one session is shared by every service
+    session = boto3.Session(region_name=config.get("region_name"))
+    service_configs = build_service_configs(config)
+    results: Dict[str, dict] = {}
     if args.interactive and "s3" not in services:
         logger.info("Interactive mode is only supported for S3 buckets.")
 
+    # Seeded in service order so the live table lists services consistently as they run side by side
+    state: Dict[str, Dict[str, ProgressReport]] = {service: {} for service in services}
+    progress_lock = threading.Lock()
+    live: Optional[Live] = None
+    row_count = 0
+    last_progress_log = 0.0
+
     def make_progress_callback(service_name: str) -> Callable[[Dict[str, object]], None]:
+        # Services emit per resource or per bucket phase, never per object, so events are applied
+        # as they come; the rows for this service are looked up once rather than on every event.
+        resources = state[service_name]
+
         def _cb(report: Dict[str, object]) -> None:
-            resource = str(report.get("resource", "unknown"))
-            report["status"] = report.get("status", "in_progress")
-            report["resource_type"] = report.get("resource_type", report.get("type", "-"))
-            state.setdefault(service_name, {})[resource] = report
-            if live_instance:
-                live_instance.update(render_live_state(state, dry_run=not args.apply))
+            nonlocal live, row_count, last_progress_log
+            # Only the displayed fields are kept, in a slotted record rather than the producer's dict
+            progress = ProgressReport.from_dict(report)
+            resource = progress.resource
+            # Services report from their own threads; the live view redraws from state on its own timer
+            stopped: Optional[Live] = None
+            with progress_lock:
+                if resource not in resources:
+                    row_count += 1
+                resources[resource] = progress
+                if live is not None:
+                    if not args.live_max_rows or row_count <= args.live_max_rows:
+                        return
+                    stopped, live = live, None
+                now = time.monotonic()
+                log_progress = now - last_progress_log >= PROGRESS_LOG_INTERVAL
+                if log_progress:
+                    last_progress_log = now
+            if stopped is not None:
+                # Past this size redrawing the table costs more than the cleanup it reports on. Stopping
+                # renders a last frame, which takes the progress lock, so it must happen outside it.
+                stopped.stop()
+                logger.info(
+                    "Live table stopped at %d rows; logging progress every %.0fs",
+                    args.live_max_rows,
+                    PROGRESS_LOG_INTERVAL,
+                )
+            if log_progress:
+                logger.info("[%s] %s %s (%d resources tracked)", service_name, resource, progress.status, row_count)
         return _cb
 
-    try:
-        if live_enabled:
-            with Live(render_live_state(state, dry_run=not args.apply), console=console, refresh_per_second=4) as live:
-                live_instance = live
-                for service in services:
-                    logger.info(f"Running {service} cleanup...")
-                    try:
-                        result = run_service_cleanup(
-                            service,
-                            config,
-                            dry_run=not args.apply,
-                            progress_callback=make_progress_callback(service),
-                            buckets_override=args.bucket,
-                            interactive=args.interactive,
-                            json_output=args.json,
-                        )
-                        results[service] = result
-                        if not args.json:
-                            logger.info(f"{service.upper()} cleanup completed: {result}")
-                    except Exception as e:
-                        logger.error(f"Error in {service} cleanup: {e}")
-                        results[service] = {"error": str(e)}
-        else:
+    def run_one(service: str) -> dict:
+        if not service_has_work(service, service_configs[service]):
+            logger.info("Skipping %s cleanup: no configured targets", service)
+            return {"skipped": "no configured targets"}
+        logger.info("Running %s cleanup...", service)
+        try:
+            result = run_service_cleanup(
+                service,
+                service_configs[service],
+                dry_run=not args.apply,
+                progress_callback=make_progress_callback(service) if live_enabled else None,
+                buckets_override=args.bucket,
+                interactive=args.interactive,
+                json_output=args.json,
+                session=session,
+            )
+        except Exception as e:
+            logger.error("Error in %s cleanup: %s", service, e)
+            return {"error": str(e)}
+        if not args.json:
+            logger.info("%s cleanup completed: %s", service.upper(), result)
+        return result
+
+    def finish(service: str, result: dict) -> None:
+        results[service] = result
+        if args.json_stream:
+            write_stdout(encode_result({service: result}))
+
+    def run_services() -> None:
+        # Interactive S3 prompts on the terminal, so services then run one at a time
+        if args.interactive or len(services) < 2:
             for service in services:
-                logger.info(f"Running {service} cleanup...")
-                try:
-                    result = run_service_cleanup(
-                        service,
-                        config,
-                        dry_run=not args.apply,
-                        buckets_override=args.bucket,
-                        interactive=args.interactive,
-                        json_output=args.json,
-                    )
-                    results[service] = result
-                    
-                    if not args.json:
-                        logger.info(f"{service.upper()} cleanup completed: {result}")
-                except Exception as e:
-                    logger.error(f"Error in {service} cleanup: {e}")
-                    results[service] = {"error": str(e)}
-    finally:
-        live_instance = None
+                finish(service, run_one(service))
+            return
+        # Every service is bound by API round trips, so running them side by side costs the slowest one
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {executor.submit(run_one, service): service for service in services}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+
+    if live_enabled:
+        view = LiveStateView(state, dry_run=not args.apply, lock=progress_lock)
+        with Live(view, console=CONSOLE, refresh_per_second=4) as live:
+            run_services()
+    else:
+        run_services()
     
     # Output results
+    if args.json_stream:
+        return
     if args.json:
-        print(json.dumps(results, default=str, indent=2))
+        write_stdout(encode_results({service: results[service] for service in services}))
     else:
         logger.info("All cleanup operations completed")
 
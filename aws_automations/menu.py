@@ -2,34 +2,18 @@
 
 from __future__ import annotations
 
-import sys
 from typing import Optional
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
 from rich.text import Text
 
-from .main import main as run_cleanup
+from ._console import CONSOLE
+from .main import SERVICE_CHOICES
 
 
-def show_banner():
-    """Display the application banner."""
-    console = Console()
-    
-    banner = Text("AWS AUTOMATIONS", style="bold blue")
-    subtitle = Text("Multi-Service Resource Cleanup Tool", style="dim")
-    
-    console.print()
-    console.print(Panel.fit(f"{banner}\n{subtitle}", border_style="blue"))
-    console.print()
-
-
-def show_services_table():
-    """Display available services in a table."""
-    console = Console()
-    
+def _build_services_table() -> Table:
     table = Table(title="Available Services", show_header=True, header_style="bold magenta")
     table.add_column("Service", style="cyan", no_wrap=True)
     table.add_column("Description", style="white")
@@ -47,40 +31,56 @@ def show_services_table():
     
     for service, desc, resources in services:
         table.add_row(service, desc, resources)
-    
-    console.print(table)
-    console.print()
+    return table
+
+
+# Static menu elements are built once and reused on every screen
+_BANNER_PANEL = Panel.fit(
+    Text.assemble(("AWS AUTOMATIONS", "bold blue"), "\n", ("Multi-Service Resource Cleanup Tool", "dim")),
+    border_style="blue",
+)
+_SERVICES_TABLE = _build_services_table()
+
+
+def show_banner():
+    """Display the application banner."""
+    CONSOLE.print()
+    CONSOLE.print(_BANNER_PANEL)
+    CONSOLE.print()
+
+
+def show_services_table():
+    """Display available services in a table."""
+    CONSOLE.print(_SERVICES_TABLE)
+    CONSOLE.print()
 
 
 def get_service_choice() -> str:
     """Get user's service selection."""
-    valid_services = ["s3", "ec2", "lambda", "ebs", "cloudwatch", "iam", "all"]
-    
     while True:
         choice = Prompt.ask(
             "Select service to clean up",
-            choices=valid_services,
-            default="all"
+            choices=list(SERVICE_CHOICES),
+            default="all",
+            console=CONSOLE,
         )
         return choice
 
 
 def get_mode_choice() -> tuple[bool, bool]:
     """Get dry-run and interactive mode choices."""
-    console = Console()
+    CONSOLE.print("[yellow]Safety Options:[/yellow]")
     
-    console.print("[yellow]Safety Options:[/yellow]")
-    
-    dry_run = not Confirm.ask("Apply changes (default is dry-run only)", default=False)
+    dry_run = not Confirm.ask("Apply changes (default is dry-run only)", default=False, console=CONSOLE)
     
     if not dry_run:
-        console.print("[red]⚠️  DESTRUCTIVE MODE ENABLED[/red]")
-        confirm = Confirm.ask("Are you sure you want to delete resources?", default=False)
+        CONSOLE.print("[red]⚠️  DESTRUCTIVE MODE ENABLED[/red]")
+        confirm = Confirm.ask("Are you sure you want to delete resources?", default=False, console=CONSOLE)
         if not confirm:
             dry_run = True
-            console.print("[green]Switched back to dry-run mode[/green]")
+            CONSOLE.print("[green]Switched back to dry-run mode[/green]")
     
-    interactive = Confirm.ask("Enable interactive approval", default=False)
+    interactive = Confirm.ask("Enable interactive approval", default=False, console=CONSOLE)
     
     return dry_run, interactive
 
@@ -91,7 +91,8 @@ def get_config_path() -> str:
     
     config_path = Prompt.ask(
         "Configuration file path",
-        default=default_config
+        default=default_config,
+        console=CONSOLE,
     )
     
     return config_path
@@ -99,8 +100,6 @@ def get_config_path() -> str:
 
 def show_summary(service: str, dry_run: bool, interactive: bool, config: str):
     """Show execution summary."""
-    console = Console()
-    
     table = Table(title="Execution Summary", show_header=False)
     table.add_column("Setting", style="cyan")
     table.add_column("Value", style="white")
@@ -110,14 +109,12 @@ def show_summary(service: str, dry_run: bool, interactive: bool, config: str):
     table.add_row("Interactive", "Yes" if interactive else "No")
     table.add_row("Config", config)
     
-    console.print(table)
-    console.print()
+    CONSOLE.print(table)
+    CONSOLE.print()
 
 
 def interactive_menu():
     """Run the interactive menu."""
-    console = Console()
-    
     try:
         show_banner()
         
@@ -125,50 +122,39 @@ def interactive_menu():
         show_services_table()
         service = get_service_choice()
         
-        console.print()
+        CONSOLE.print()
         
         # Mode selection
         dry_run, interactive = get_mode_choice()
         
-        console.print()
+        CONSOLE.print()
         
         # Config selection
         config_path = get_config_path()
         
-        console.print()
+        CONSOLE.print()
         
         # Summary
         show_summary(service, dry_run, interactive, config_path)
         
         # Final confirmation
-        if not Confirm.ask("Proceed with cleanup?", default=True):
-            console.print("[yellow]Operation cancelled[/yellow]")
+        if not Confirm.ask("Proceed with cleanup?", default=True, console=CONSOLE):
+            CONSOLE.print("[yellow]Operation cancelled[/yellow]")
             return
         
-        console.print()
-        console.print("[green]Starting cleanup...[/green]")
-        console.print()
-        
-        # Build arguments for main function
-        args = [
-            "--config", config_path,
-            "--service", service
-        ]
+        CONSOLE.print()
+        CONSOLE.print("[green]Starting cleanup...[/green]")
+        CONSOLE.print()
         
-        if not dry_run:
-            args.append("--apply")
-        
-        if interactive:
-            args.append("--interactive")
-        
-        # Run the cleanup
-        sys.argv = ["aws-cleanup"] + args
-        run_cleanup()
+        # Run the cleanup in-process with the chosen options
+        from .main import default_args, run
+
+        run(default_args(config=config_path, service=service, apply=not dry_run, interactive=interactive))
         
     except KeyboardInterrupt:
-        console.print("\n[yellow]Operation cancelled by user[/yellow]")
+        CONSOLE.print("\n[yellow]Operation cancelled by user[/yellow]")
     except Exception as e:
-        console.print(f"\n[red]Error: {e}[/red]")
+        CONSOLE.print(f"\n[red]Error: {e}[/red]")
 
 
 if __name__ == "__main__":
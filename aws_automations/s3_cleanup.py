@@ -3,47 +3,136 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import queue
 import sys
+import threading
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta, timezone
-from typing import Callable, Dict, Iterable, List, Optional, Sequence
+from functools import partial
+from itertools import chain
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 import boto3
 from botocore.exceptions import ClientError
 from rich import box
-from rich.console import Console, Group
+from rich.console import Group
 from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from ._boto import make_client
+from ._console import CONSOLE
+from ._time import ensure_tz
 from .config import BucketTagFilter, CleanupConfig
 
 logger = logging.getLogger("s3_cleanup")
 
 
-def chunked(items: Sequence[dict], size: int) -> Iterable[List[dict]]:
-    for idx in range(0, len(items), size):
-        yield list(items[idx : idx + size])
+def chunked(items: Iterable[dict], size: int) -> Iterator[Sequence[dict]]:
+    """Yield batches of at most ``size``; lists and tuples are sliced directly, anything else is copied once."""
+    if not isinstance(items, (list, tuple)):
+        items = list(items)
+    return (items[idx : idx + size] for idx in range(0, len(items), size))
 
 
-def ensure_tz(dt: datetime) -> datetime:
-    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
-
-
-def bucket_matches_prefixes(name: str, prefixes: List[str]) -> bool:
+def bucket_matches_prefixes(name: str, prefixes: Sequence[str]) -> bool:
     if not prefixes:
         return True
-    return any(name.startswith(prefix) for prefix in prefixes)
+    return name.startswith(tuple(prefixes))
+
+
+@dataclass(frozen=True)
+class BucketNameFilter:
+    """Name-based bucket selection, built once per run so each bucket costs a few set lookups."""
+
+    override: FrozenSet[str]
+    targets: FrozenSet[str]
+    ignores: FrozenSet[str]
+    prefixes: Tuple[str, ...]
+
+    @classmethod
+    def from_config(cls, config: CleanupConfig, override: Optional[List[str]] = None) -> "BucketNameFilter":
+        return cls(
+            override=frozenset(override or ()),
+            targets=frozenset(config.target_buckets),
+            ignores=frozenset(config.ignore_buckets),
+            prefixes=tuple(config.bucket_prefixes),
+        )
+
+    def matches(self, name: str) -> bool:
+        if self.override and name not in self.override:
+            return False
+        if self.targets and name not in self.targets:
+            return False
+        if name in self.ignores:
+            return False
+        return not self.prefixes or name.startswith(self.prefixes)
 
 
-def bucket_has_required_tag(client, bucket: str, required_tag: BucketTagFilter) -> bool:
+@dataclass
+class BucketCache:
+    """Bucket lookups reused between the plan and apply passes of one run.
+
+    Only results that cleanup cannot invalidate are kept: tag sets, versioning status, buckets
+    already found empty, and the bucket listing until a run deletes a bucket.
+    """
+
+    tags: Dict[str, Optional[Dict[str, str]]] = field(default_factory=dict)
+    versioning: Dict[str, Optional[str]] = field(default_factory=dict)
+    empty: Set[str] = field(default_factory=set)
+    buckets: Optional[List[dict]] = None
+
+
+def get_bucket_tags(client, bucket: str, cache: Optional[BucketCache] = None) -> Optional[Dict[str, str]]:
+    """Return the bucket's tags, or ``None`` when they cannot be read."""
+    if cache is not None and bucket in cache.tags:
+        return cache.tags[bucket]
     try:
         response = client.get_bucket_tagging(Bucket=bucket)
     except ClientError as exc:  # noqa: PERF203 - explicit branches help logging
         logger.info("Skipping %s: cannot read tags (%s)", bucket, exc.response.get("Error", {}).get("Code"))
+        tags = None
+    else:
+        tags = {tag["Key"]: tag["Value"] for tag in response.get("TagSet", [])}
+    if cache is not None:
+        cache.tags[bucket] = tags
+    return tags
+
+
+def get_bucket_versioning_status(s3_client, bucket: str, cache: Optional[BucketCache] = None) -> Optional[str]:
+    """Return ``"Enabled"``, ``"Suspended"``, ``""`` if versioning was never enabled, or ``None`` if unreadable."""
+    if cache is not None and bucket in cache.versioning:
+        return cache.versioning[bucket]
+    try:
+        status: Optional[str] = s3_client.get_bucket_versioning(Bucket=bucket).get("Status", "")
+    except ClientError as exc:  # noqa: PERF203
+        logger.debug("Cannot read versioning for %s: %s", bucket, exc.response.get("Error", {}).get("Code"))
+        status = None
+    if cache is not None:
+        cache.versioning[bucket] = status
+    return status
+
+
+def may_have_versions(s3_client, bucket: str, cache: Optional[BucketCache] = None) -> bool:
+    """False only for buckets that never had versioning, whose versions are just their current objects."""
+    return get_bucket_versioning_status(s3_client, bucket, cache) != ""
+
+
+def tags_match(tags: Optional[Dict[str, str]], required_tag: BucketTagFilter) -> bool:
+    if tags is None or required_tag.key not in tags:
         return False
+    return required_tag.value is None or tags[required_tag.key] == required_tag.value
 
-    tags = {tag["Key"]: tag["Value"] for tag in response.get("TagSet", [])}
+
+def bucket_has_required_tag(
+    client, bucket: str, required_tag: BucketTagFilter, cache: Optional[BucketCache] = None
+) -> bool:
+    tags = get_bucket_tags(client, bucket, cache)
+    if tags is None:
+        return False
     if required_tag.key not in tags:
         logger.debug("Skipping %s: tag %s missing", bucket, required_tag.key)
         return False
@@ -53,6 +142,39 @@ def bucket_has_required_tag(client, bucket: str, required_tag: BucketTagFilter)
     return True
 
 
+def bucket_is_old_enough(bucket_name: str, creation_date: datetime, config: CleanupConfig, now: datetime) -> bool:
+    if config.bucket_retention_days is None:
+        return True
+    if ensure_tz(creation_date) > now - timedelta(days=config.bucket_retention_days):
+        logger.debug("Skipping %s: bucket age below retention", bucket_name)
+        return False
+    return True
+
+
+def prefetch_bucket_metadata(
+    s3_client,
+    bucket_names: List[str],
+    config: CleanupConfig,
+    cache: BucketCache,
+    executor: Optional[Executor] = None,
+) -> None:
+    """Load the tags and versioning status later steps will ask for into ``cache``, concurrently on ``executor``.
+
+    Versioning is only fetched for buckets whose tags already pass ``require_tag``.
+    """
+    mapper = executor.map if executor is not None else map
+    if config.require_tag:
+        required = config.require_tag
+        list(mapper(partial(get_bucket_tags, s3_client, cache=cache), bucket_names))
+        bucket_names = [name for name in bucket_names if tags_match(cache.tags.get(name), required)]
+
+    listing_versions = config.include_versioned_objects and (
+        config.object_retention_days is not None or config.delete_all_objects
+    )
+    if listing_versions or config.delete_empty_buckets:
+        list(mapper(partial(get_bucket_versioning_status, s3_client, cache=cache), bucket_names))
+
+
 def should_target_bucket(
     bucket_name: str,
     creation_date: datetime,
@@ -60,94 +182,383 @@ def should_target_bucket(
     now: datetime,
     s3_client,
     targeted_bucket_override: Optional[List[str]] = None,
+    cache: Optional[BucketCache] = None,
+    name_filter: Optional[BucketNameFilter] = None,
 ) -> bool:
-    override = targeted_bucket_override or []
-    if override and bucket_name not in override:
-        return False
-    if config.target_buckets and bucket_name not in config.target_buckets:
+    if name_filter is None:
+        name_filter = BucketNameFilter.from_config(config, targeted_bucket_override)
+    if not name_filter.matches(bucket_name):
         return False
-    if bucket_name in config.ignore_buckets:
+    if not bucket_is_old_enough(bucket_name, creation_date, config, now):
         return False
-    if not bucket_matches_prefixes(bucket_name, config.bucket_prefixes):
-        return False
-    if config.bucket_retention_days is not None:
-        cutoff = now - timedelta(days=config.bucket_retention_days)
-        if ensure_tz(creation_date) > cutoff:
-            logger.debug("Skipping %s: bucket age below retention", bucket_name)
-            return False
-    if config.require_tag and not bucket_has_required_tag(s3_client, bucket_name, config.require_tag):
+    if config.require_tag and not bucket_has_required_tag(s3_client, bucket_name, config.require_tag, cache):
         return False
     return True
 
 
-def collect_objects_for_deletion(s3_client, bucket: str, config: CleanupConfig, now: datetime) -> List[dict]:
-    if config.object_retention_days is None and not config.delete_all_objects:
-        return []
+# Listing pages buffered per bucket before the partition workers wait for the consumer to catch up
+LISTING_QUEUE_PAGES = 8
+# Partition workers a listing starts for itself when no shared listing executor is passed
+DEFAULT_LISTING_WORKERS = 16
+
+# Put on the page queue by a partition worker once its prefix is fully listed
+_PARTITION_DONE = object()
 
-    cutoff = None if config.delete_all_objects else now - timedelta(days=config.object_retention_days or 0)
-    paginator = s3_client.get_paginator("list_objects_v2")
-    deletions: List[dict] = []
 
-    for page in paginator.paginate(Bucket=bucket):
+def _paginate_prefix(
+    s3_client, operation: str, bucket: str, prefix: str, pages: "queue.Queue[object]", stop: threading.Event
+) -> None:
+    """Put one partition's pages on ``pages``, then ``_PARTITION_DONE`` or the error that ended the listing."""
+    try:
+        for page in s3_client.get_paginator(operation).paginate(Bucket=bucket, Prefix=prefix):
+            if stop.is_set():
+                break
+            pages.put(page)
+    except Exception as exc:  # re-raised on the consuming thread
+        pages.put(exc)
+        return
+    pages.put(_PARTITION_DONE)
+
+
+def _iter_partitioned_pages(
+    s3_client, operation: str, bucket: str, prefixes: List[str], executor: Executor
+) -> Iterator[dict]:
+    pages: "queue.Queue[object]" = queue.Queue(maxsize=LISTING_QUEUE_PAGES)
+    stop = threading.Event()
+    futures = [
+        executor.submit(_paginate_prefix, s3_client, operation, bucket, prefix, pages, stop) for prefix in prefixes
+    ]
+    remaining = len(futures)
+    try:
+        while remaining:
+            item = pages.get()
+            if item is _PARTITION_DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                remaining -= 1
+                raise item
+            else:
+                yield item  # type: ignore[misc]
+    finally:
+        # On early exit, stop the workers and drain the queue so none stays blocked on a full one
+        stop.set()
+        remaining -= sum(1 for future in futures if future.cancel())
+        while remaining > 0:
+            item = pages.get()
+            if item is _PARTITION_DONE or isinstance(item, Exception):
+                remaining -= 1
+
+
+def _iter_listing_with_own_pool(s3_client, operation: str, bucket: str, prefixes: List[str]) -> Iterator[dict]:
+    with ThreadPoolExecutor(max_workers=min(len(prefixes), DEFAULT_LISTING_WORKERS)) as executor:
+        yield from _iter_partitioned_pages(s3_client, operation, bucket, prefixes, executor)
+
+
+def iter_listing_pages(
+    s3_client,
+    operation: str,
+    bucket: str,
+    prefixes: Optional[List[str]] = None,
+    executor: Optional[Executor] = None,
+) -> Iterable[dict]:
+    """Yield the pages of a bucket listing, walking each of ``prefixes`` concurrently when given.
+
+    Partitions are listed on ``executor``, shared across buckets so the total fan-out stays bounded,
+    or on a small pool of their own. Pages are yielded as they arrive, in no particular order, and at
+    most ``LISTING_QUEUE_PAGES`` wait in memory.
+    """
+    if not prefixes:
+        pages: Iterable[dict] = s3_client.get_paginator(operation).paginate(Bucket=bucket)
+        return pages
+    if executor is None:
+        return _iter_listing_with_own_pool(s3_client, operation, bucket, prefixes)
+    return _iter_partitioned_pages(s3_client, operation, bucket, prefixes, executor)
+
+
+def object_cutoff_timestamp(config: CleanupConfig, now: datetime) -> Optional[float]:
+    """Epoch seconds at or before which objects expire; ``None`` when every object is targeted.
+
+    Listings are compared as floats because botocore returns aware datetimes, and aware
+    datetime comparisons are far slower than a float compare over millions of keys.
+    """
+    if config.delete_all_objects:
+        return None
+    return (now - timedelta(days=config.object_retention_days or 0)).timestamp()
+
+
+def _iter_expired_keys(
+    s3_client, bucket: str, config: CleanupConfig, now: datetime, list_executor: Optional[Executor] = None
+) -> Iterator[str]:
+    cutoff = object_cutoff_timestamp(config, now)
+    prefixes = config.list_prefix_partitions
+    for page in iter_listing_pages(s3_client, "list_objects_v2", bucket, prefixes, list_executor):
         for obj in page.get("Contents", []):
-            last_modified = ensure_tz(obj["LastModified"])
-            if config.delete_all_objects or last_modified <= cutoff:
-                deletions.append({"Key": obj["Key"]})
-    return deletions
+            if cutoff is None or obj["LastModified"].timestamp() <= cutoff:
+                yield obj["Key"]
+
 
+def iter_objects_for_deletion(s3_client, bucket: str, config: CleanupConfig, now: datetime) -> Iterator[dict]:
+    """Yield ``{"Key": ...}`` entries for expired objects as listing pages arrive."""
+    if config.object_retention_days is None and not config.delete_all_objects:
+        return
 
-def collect_versions_for_deletion(s3_client, bucket: str, config: CleanupConfig, now: datetime) -> List[dict]:
+    for key in _iter_expired_keys(s3_client, bucket, config, now):
+        yield {"Key": key}
+
+
+def iter_versions_for_deletion(
+    s3_client, bucket: str, config: CleanupConfig, now: datetime, cache: Optional[BucketCache] = None
+) -> Iterator[dict]:
+    """Yield ``{"Key": ..., "VersionId": ...}`` entries for expired versions and delete markers."""
     if not config.include_versioned_objects:
-        return []
+        return
     if config.object_retention_days is None and not config.delete_all_objects:
-        return []
-    cutoff = None if config.delete_all_objects else now - timedelta(days=config.object_retention_days or 0)
-    paginator = s3_client.get_paginator("list_object_versions")
-    deletions: List[dict] = []
+        return
+    if not may_have_versions(s3_client, bucket, cache):
+        return
+    cutoff = object_cutoff_timestamp(config, now)
 
+    # Listings are lazy, so errors surface while pages are read rather than when the listing is set up
     try:
-        page_iterator = paginator.paginate(Bucket=bucket)
-    except ClientError as exc:  # noqa: PERF203 - explicit branch for logging
+        for page in iter_listing_pages(s3_client, "list_object_versions", bucket, config.list_prefix_partitions):
+            for version in chain(page.get("Versions", ()), page.get("DeleteMarkers", ())):
+                if cutoff is None or version["LastModified"].timestamp() <= cutoff:
+                    yield {"Key": version["Key"], "VersionId": version.get("VersionId")}
+    except ClientError as exc:
         logger.info("Skipping version scan for %s: %s", bucket, exc.response.get("Error", {}).get("Code"))
-        return []
 
-    for page in page_iterator:
-        versions = page.get("Versions", []) + page.get("DeleteMarkers", [])
-        for version in versions:
-            last_modified = ensure_tz(version["LastModified"])
-            if config.delete_all_objects or last_modified <= cutoff:
-                deletions.append({"Key": version["Key"], "VersionId": version.get("VersionId")})
-    return deletions
+
+def collect_objects_for_deletion(s3_client, bucket: str, config: CleanupConfig, now: datetime) -> List[dict]:
+    return list(iter_objects_for_deletion(s3_client, bucket, config, now))
+
+
+def collect_versions_for_deletion(
+    s3_client, bucket: str, config: CleanupConfig, now: datetime, cache: Optional[BucketCache] = None
+) -> List[dict]:
+    return list(iter_versions_for_deletion(s3_client, bucket, config, now, cache))
+
+
+def iter_bucket_deletions(
+    s3_client,
+    bucket: str,
+    config: CleanupConfig,
+    now: datetime,
+    cache: Optional[BucketCache] = None,
+    list_executor: Optional[Executor] = None,
+) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Yield ``(kind, key, version_id)`` for everything cleanup should delete from ``bucket``.
+
+    ``kind`` is ``"objects"`` or ``"versions"``. When versions are in scope a versioned bucket is
+    walked once with list_object_versions, which returns current versions too. Those count as
+    objects but are deleted by VersionId like the rest, so no delete markers are left behind.
+    Other buckets are walked with list_objects_v2 and yield a ``None`` version id. Prefix
+    partitions are listed on ``list_executor`` when given, see :func:`iter_listing_pages`.
+    """
+    if config.object_retention_days is None and not config.delete_all_objects:
+        return
+    if not (config.include_versioned_objects and may_have_versions(s3_client, bucket, cache)):
+        for key in _iter_expired_keys(s3_client, bucket, config, now, list_executor):
+            yield "objects", key, None
+        return
+
+    cutoff = object_cutoff_timestamp(config, now)
+    prefixes = config.list_prefix_partitions
+    for page in iter_listing_pages(s3_client, "list_object_versions", bucket, prefixes, list_executor):
+        for version in page.get("Versions", ()):
+            if cutoff is None or version["LastModified"].timestamp() <= cutoff:
+                kind = "objects" if version.get("IsLatest") else "versions"
+                yield kind, version["Key"], version.get("VersionId")
+        for marker in page.get("DeleteMarkers", ()):
+            if cutoff is None or marker["LastModified"].timestamp() <= cutoff:
+                yield "versions", marker["Key"], marker.get("VersionId")
+
+
+@dataclass
+class DeletionBatch:
+    """Keys waiting on one ``delete_objects`` call, kept as parallel lists rather than request dicts.
+
+    ``version_ids`` holds ``None`` for plain key deletes. The request payload is only built by
+    :meth:`objects`, right before the call, so queued batches hold no per-key dicts.
+    """
+
+    __slots__ = ("kind", "keys", "version_ids")
+
+    kind: str
+    keys: List[str]
+    version_ids: List[Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def objects(self) -> List[dict]:
+        return [
+            {"Key": key} if version_id is None else {"Key": key, "VersionId": version_id}
+            for key, version_id in zip(self.keys, self.version_ids)
+        ]
+
+
+def iter_deletion_batches(entries: Iterable[Tuple[str, str, Optional[str]]], size: int) -> Iterator[DeletionBatch]:
+    """Group ``(kind, key, version_id)`` entries into per-kind batches of at most ``size``."""
+    pending: Dict[str, DeletionBatch] = {}
+    for kind, key, version_id in entries:
+        batch = pending.get(kind)
+        if batch is None:
+            batch = pending[kind] = DeletionBatch(kind, [], [])
+        batch.keys.append(key)
+        batch.version_ids.append(version_id)
+        if len(batch) >= size:
+            yield pending.pop(kind)
+    yield from pending.values()
+
+
+def delete_batch(s3_client, bucket: str, batch: Sequence[dict], dry_run: bool) -> int:
+    if dry_run:
+        logger.info("Dry run: would delete %s objects from %s", len(batch), bucket)
+        return len(batch)
+
+    # Quiet mode only reports failures, so the deleted count is whatever did not fail
+    resp = s3_client.delete_objects(Bucket=bucket, Delete={"Objects": batch, "Quiet": True})
+    errors = resp.get("Errors", [])
+    if errors:
+        logger.warning(
+            "Could not delete %s of %s objects from %s (first error: %s)",
+            len(errors),
+            len(batch),
+            bucket,
+            errors[0].get("Code"),
+        )
+    return len(batch) - len(errors)
 
 
-def delete_objects(s3_client, bucket: str, objects: List[dict], dry_run: bool, batch_size: int) -> int:
+def delete_objects(
+    s3_client,
+    bucket: str,
+    objects: List[dict],
+    dry_run: bool,
+    batch_size: int,
+    executor: Optional[Executor] = None,
+) -> int:
+    """Delete ``objects`` in batches, running the batches concurrently on ``executor`` when given."""
     if not objects:
         return 0
 
-    deleted = 0
-    for batch in chunked(objects, batch_size):
+    delete = partial(delete_batch, s3_client, bucket, dry_run=dry_run)
+    # Dry runs and single batches make no concurrent API calls, so keep them off the pool.
+    concurrent = executor is not None and not dry_run and len(objects) > batch_size
+    mapper = executor.map if concurrent else map  # type: ignore[union-attr]
+    return sum(mapper(delete, chunked(objects, batch_size)))
+
+
+def _delete_pending_batch(s3_client, bucket: str, batch: DeletionBatch, dry_run: bool) -> int:
+    return delete_batch(s3_client, bucket, batch.objects(), dry_run)
+
+
+def pipeline_deletes(
+    s3_client,
+    bucket: str,
+    batches: Iterable[DeletionBatch],
+    dry_run: bool,
+    delete_executor: Executor,
+    max_in_flight: int,
+) -> Iterator[Counter]:
+    """Delete ``batches`` as they are listed, yielding running per-kind totals.
+
+    Totals are keyed ``<kind>_planned`` and ``<kind>_deleted``. At most ``max_in_flight`` batches
+    wait on ``delete_executor`` at once, so memory stays bounded however large the bucket is.
+    """
+    totals: Counter = Counter()
+    in_flight: Deque[Tuple[str, Future]] = deque()
+    for batch in batches:
+        kind = batch.kind
+        totals[f"{kind}_planned"] += len(batch)
         if dry_run:
-            logger.info("Dry run: would delete %s objects from %s", len(batch), bucket)
-            deleted += len(batch)
-            continue
+            totals[f"{kind}_deleted"] += _delete_pending_batch(s3_client, bucket, batch, dry_run)
+        else:
+            in_flight.append((kind, delete_executor.submit(_delete_pending_batch, s3_client, bucket, batch, dry_run)))
+            if len(in_flight) >= max_in_flight:
+                done_kind, future = in_flight.popleft()
+                totals[f"{done_kind}_deleted"] += future.result()
+        yield totals
 
-        resp = s3_client.delete_objects(Bucket=bucket, Delete={"Objects": batch, "Quiet": True})
-        deleted += len(resp.get("Deleted", []))
-    return deleted
+    if in_flight:
+        for done_kind, future in in_flight:
+            totals[f"{done_kind}_deleted"] += future.result()
+        yield totals
 
 
-def bucket_is_empty(s3_client, bucket: str) -> bool:
-    obj_resp = s3_client.list_objects_v2(Bucket=bucket, MaxKeys=1)
-    if obj_resp.get("KeyCount", 0) > 0:
+LIFECYCLE_RULE_ID = "aws-automations-cleanup"
+
+
+def build_lifecycle_rule(config: CleanupConfig) -> Optional[dict]:
+    """Lifecycle rule that expires what the config would delete, or ``None`` when object cleanup is off.
+
+    Lifecycle days must be at least 1, so shorter retentions (and ``delete_all_objects``) expire after a day.
+    """
+    if config.delete_all_objects:
+        days = 1
+    elif config.object_retention_days is not None:
+        days = max(config.object_retention_days, 1)
+    else:
+        return None
+    rule = {"ID": LIFECYCLE_RULE_ID, "Status": "Enabled", "Filter": {"Prefix": ""}, "Expiration": {"Days": days}}
+    if config.include_versioned_objects:
+        rule["NoncurrentVersionExpiration"] = {"NoncurrentDays": days}
+    return rule
+
+
+def put_lifecycle_rule(s3_client, bucket: str, rule: dict, dry_run: bool) -> bool:
+    """Install ``rule`` on ``bucket``, replacing an earlier copy of it but keeping the bucket's other rules."""
+    if dry_run:
+        logger.info("Dry run: would set lifecycle rule %s on %s", rule["ID"], bucket)
         return False
 
     try:
-        ver_resp = s3_client.list_object_versions(Bucket=bucket, MaxKeys=1)
-        if ver_resp.get("Versions") or ver_resp.get("DeleteMarkers"):
+        existing = s3_client.get_bucket_lifecycle_configuration(Bucket=bucket).get("Rules", [])
+    except ClientError as exc:  # noqa: PERF203
+        if exc.response.get("Error", {}).get("Code") != "NoSuchLifecycleConfiguration":
+            logger.warning("Could not read lifecycle rules for %s: %s", bucket, exc)
             return False
-    except ClientError:
-        # Bucket is likely not versioned
-        pass
+        existing = []
+
+    rules = [existing_rule for existing_rule in existing if existing_rule.get("ID") != rule["ID"]]
+    rules.append(rule)
+    try:
+        s3_client.put_bucket_lifecycle_configuration(Bucket=bucket, LifecycleConfiguration={"Rules": rules})
+    except ClientError as exc:  # noqa: PERF203
+        logger.warning("Could not set lifecycle rule on %s: %s", bucket, exc)
+        return False
+    return True
+
+
+def listing_covers_bucket(s3_client, bucket: str, config: CleanupConfig, cache: Optional[BucketCache] = None) -> bool:
+    """True when one cleanup pass targets every key, version, and delete marker in ``bucket``.
+
+    Prefix partitions may leave keys unlisted, and plain key deletes in a versioned bucket
+    leave versions and delete markers behind.
+    """
+    if not config.delete_all_objects or config.list_prefix_partitions:
+        return False
+    return config.include_versioned_objects or not may_have_versions(s3_client, bucket, cache)
+
+
+def bucket_is_empty(s3_client, bucket: str, cache: Optional[BucketCache] = None) -> bool:
+    if cache is not None and bucket in cache.empty:
+        return True
+    obj_resp = s3_client.list_objects_v2(Bucket=bucket, MaxKeys=1)
+    if obj_resp.get("KeyCount", 0) > 0:
+        return False
+
+    if may_have_versions(s3_client, bucket, cache):
+        try:
+            ver_resp = s3_client.list_object_versions(Bucket=bucket, MaxKeys=1)
+            if ver_resp.get("Versions") or ver_resp.get("DeleteMarkers"):
+                return False
+        except ClientError:
+            # Bucket is likely not versioned
+            pass
+    # Non-empty results are not kept: the apply pass may empty the bucket
+    if cache is not None:
+        cache.empty.add(bucket)
     return True
 
 
@@ -164,6 +575,103 @@ def maybe_delete_bucket(s3_client, bucket: str, dry_run: bool) -> bool:
         return False
 
 
+@dataclass
+class RunSummary:
+    """Totals for one ``run_cleanup`` call; ``as_dict`` gives the summary dict callers receive."""
+
+    dry_run: bool
+    buckets_scanned: int = 0
+    buckets_targeted: int = 0
+    objects_deleted: int = 0
+    versions_deleted: int = 0
+    buckets_deleted: int = 0
+    lifecycle_rules_set: int = 0
+    bucket_reports: List[dict] = field(default_factory=list)
+
+    def add_bucket(self, result: dict, *, collect_details: bool = False) -> None:
+        """Fold in one ``_process_bucket`` result."""
+        self.buckets_targeted += 1
+        self.objects_deleted += result["objects_deleted"]
+        self.versions_deleted += result["versions_deleted"]
+        if result.pop("bucket_deleted"):
+            self.buckets_deleted += 1
+        if result.pop("lifecycle_rule_set", False):
+            self.lifecycle_rules_set += 1
+        if collect_details:
+            self.bucket_reports.append(result)
+
+    def as_dict(self) -> dict:
+        # Shallow on purpose: dataclasses.asdict would deep-copy every bucket report
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def _process_bucket(
+    s3_client,
+    bucket_info: dict,
+    *,
+    config: CleanupConfig,
+    now: datetime,
+    dry_run: bool,
+    name_filter: BucketNameFilter,
+    cache: Optional[BucketCache],
+    delete_executor: Executor,
+    list_executor: Optional[Executor] = None,
+    progress_callback: Optional[Callable[[Dict[str, object]], None]],
+) -> Optional[dict]:
+    """Plan and apply cleanup for one bucket; ``None`` when the bucket is filtered out."""
+    bucket_name = bucket_info["Name"]
+    creation_date = ensure_tz(bucket_info["CreationDate"])
+
+    if not should_target_bucket(
+        bucket_name, creation_date, config, now, s3_client, cache=cache, name_filter=name_filter
+    ):
+        return None
+
+    logger.info("Processing bucket %s", bucket_name)
+
+    counts = {"objects_planned": 0, "versions_planned": 0, "objects_deleted": 0, "versions_deleted": 0}
+
+    def report(status: str) -> None:
+        if progress_callback:
+            progress_callback(
+                {"resource": bucket_name, "bucket": bucket_name, "status": status, **counts, "dry_run": dry_run}
+            )
+
+    report("in_progress")
+    if config.use_lifecycle_for_bulk:
+        # S3 expires the objects itself, so there is nothing to list, delete, or find empty yet
+        rule = build_lifecycle_rule(config)
+        lifecycle_set = rule is not None and put_lifecycle_rule(s3_client, bucket_name, rule, dry_run)
+        report("completed")
+        return {"bucket": bucket_name, **counts, "bucket_deleted": False, "lifecycle_rule_set": lifecycle_set}
+
+    entries = iter_bucket_deletions(s3_client, bucket_name, config, now, cache, list_executor)
+    batches = iter_deletion_batches(entries, config.max_delete_batch)
+    for totals in pipeline_deletes(
+        s3_client, bucket_name, batches, dry_run, delete_executor, config.max_concurrent_deletes
+    ):
+        counts.update(totals)
+        report("in_progress")
+    report("completed")
+
+    bucket_deleted = False
+    if config.delete_empty_buckets:
+        all_deleted = (
+            counts["objects_deleted"] == counts["objects_planned"]
+            and counts["versions_deleted"] == counts["versions_planned"]
+        )
+        if cache is not None and not dry_run and all_deleted:
+            if listing_covers_bucket(s3_client, bucket_name, config, cache):
+                # Everything the walk found is gone, so the bucket is empty without asking S3 again
+                cache.empty.add(bucket_name)
+        if bucket_is_empty(s3_client, bucket_name, cache):
+            bucket_deleted = maybe_delete_bucket(s3_client, bucket_name, dry_run)
+        else:
+            logger.info("Bucket %s not empty; skipping deletion", bucket_name)
+
+    return {"bucket": bucket_name, **counts, "bucket_deleted": bucket_deleted}
+
+
 def run_cleanup(
     config: CleanupConfig,
     *,
@@ -172,102 +680,74 @@ def run_cleanup(
     session: Optional[boto3.Session] = None,
     collect_details: bool = False,
     progress_callback: Optional[Callable[[Dict[str, object]], None]] = None,
+    cache: Optional[BucketCache] = None,
 ) -> dict:
+    """Clean up targeted buckets; pass the same ``cache`` to a plan and its apply to skip repeat lookups."""
     now = datetime.now(timezone.utc)
-    sess = session or boto3.Session(region_name=config.region_name)
-    s3_client = sess.client("s3", region_name=config.region_name)
-
-    response = s3_client.list_buckets()
-    buckets = response.get("Buckets", [])
-
-    summary = {
-        "dry_run": dry_run,
-        "buckets_scanned": len(buckets),
-        "buckets_targeted": 0,
-        "objects_deleted": 0,
-        "versions_deleted": 0,
-        "buckets_deleted": 0,
-        "bucket_reports": [],
-    }
-
-    for bucket_info in buckets:
-        bucket_name = bucket_info["Name"]
-        creation_date = ensure_tz(bucket_info["CreationDate"])
-
-        if not should_target_bucket(bucket_name, creation_date, config, now, s3_client, buckets_override):
-            continue
-
-        logger.info("Processing bucket %s", bucket_name)
-        summary["buckets_targeted"] += 1
-
-        objects_to_delete = collect_objects_for_deletion(s3_client, bucket_name, config, now)
-        versions_to_delete = collect_versions_for_deletion(s3_client, bucket_name, config, now)
-
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": bucket_name,
-                    "bucket": bucket_name,
-                    "status": "planned",
-                    "objects_planned": len(objects_to_delete),
-                    "versions_planned": len(versions_to_delete),
-                    "objects_deleted": 0,
-                    "versions_deleted": 0,
-                    "dry_run": dry_run,
-                }
-            )
-
-        deleted_objects = delete_objects(
-            s3_client,
-            bucket_name,
-            objects_to_delete,
-            dry_run,
-            config.max_delete_batch,
-        )
-
-        deleted_versions = delete_objects(
+    # boto3 low-level clients are thread-safe, so one client is shared by every worker; make_client
+    # caches it, so a plan and its apply also share one client and connection pool.
+    # Bucket workers, plus the shared pool that lists their prefix partitions when partitions are set
+    request_workers = config.max_workers * (2 if config.list_prefix_partitions else 1)
+    pool_size = request_workers + config.max_concurrent_deletes
+    s3_client = make_client("s3", config.region_name, session=session, max_pool_connections=pool_size)
+
+    if cache is None:
+        # Scoped to this run, so the lookups prefetched below are shared with the workers
+        cache = BucketCache()
+    if cache.buckets is None:
+        cache.buckets = s3_client.list_buckets().get("Buckets", [])
+    buckets = cache.buckets
+
+    summary = RunSummary(dry_run=dry_run, buckets_scanned=len(buckets))
+
+    # Workers report progress concurrently; serialize them for callbacks that are not thread-safe.
+    callback_lock = threading.Lock()
+
+    def locked_callback(report: Dict[str, object]) -> None:
+        with callback_lock:
+            progress_callback(report)  # type: ignore[misc]
+
+    name_filter = BucketNameFilter.from_config(config, buckets_override)
+    # Name and age checks cost no API calls, so buckets that fail them never reach a worker thread
+    candidates = [
+        bucket_info
+        for bucket_info in buckets
+        if name_filter.matches(bucket_info["Name"])
+        and bucket_is_old_enough(bucket_info["Name"], bucket_info["CreationDate"], config, now)
+    ]
+
+    delete_pool = ThreadPoolExecutor(max_workers=config.max_concurrent_deletes)
+    # Shared by every bucket's prefix partitions, so their fan-out is capped at max_workers in total
+    list_pool = ThreadPoolExecutor(max_workers=config.max_workers)
+    with delete_pool as delete_executor, list_pool as list_executor:
+        process_bucket = partial(
+            _process_bucket,
             s3_client,
-            bucket_name,
-            versions_to_delete,
-            dry_run,
-            config.max_delete_batch,
+            config=config,
+            now=now,
+            dry_run=dry_run,
+            name_filter=name_filter,
+            cache=cache,
+            delete_executor=delete_executor,
+            list_executor=list_executor,
+            progress_callback=locked_callback if progress_callback else None,
         )
-        summary["objects_deleted"] += deleted_objects
-        summary["versions_deleted"] += deleted_versions
-
-        if progress_callback:
-            progress_callback(
-                {
-                    "resource": bucket_name,
-                    "bucket": bucket_name,
-                    "status": "completed",
-                    "objects_planned": len(objects_to_delete),
-                    "versions_planned": len(versions_to_delete),
-                    "objects_deleted": deleted_objects,
-                    "versions_deleted": deleted_versions,
-                    "dry_run": dry_run,
-                }
-            )
-
-        if config.delete_empty_buckets:
-            if bucket_is_empty(s3_client, bucket_name):
-                if maybe_delete_bucket(s3_client, bucket_name, dry_run):
-                    summary["buckets_deleted"] += 1
-            else:
-                logger.info("Bucket %s not empty; skipping deletion", bucket_name)
 
-        if collect_details:
-            summary["bucket_reports"].append(
-                {
-                    "bucket": bucket_name,
-                    "objects_planned": len(objects_to_delete),
-                    "versions_planned": len(versions_to_delete),
-                    "objects_deleted": deleted_objects,
-                    "versions_deleted": deleted_versions,
-                }
-            )
+        # Results are folded in on this thread, in list_buckets order, so the summary needs no lock.
+        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
+            # A single bucket gains nothing from the pool, so it runs on this thread.
+            concurrent = len(candidates) > 1
+            # Tag and versioning lookups for all candidates go out together, ahead of the per-bucket work
+            candidate_names = [bucket_info["Name"] for bucket_info in candidates]
+            prefetch_bucket_metadata(s3_client, candidate_names, config, cache, executor if concurrent else None)
+            mapper = executor.map if concurrent else map
+            for result in mapper(process_bucket, candidates):
+                if result is not None:
+                    summary.add_bucket(result, collect_details=collect_details)
 
-    return summary
+    if summary.buckets_deleted:
+        cache.buckets = None
+    return summary.as_dict()
 
 
 def parse_args() -> argparse.Namespace:
@@ -333,6 +813,11 @@ def parse_args() -> argparse.Namespace:
 
 
 def policy_summary(config: CleanupConfig) -> str:
+    if config.use_lifecycle_for_bulk:
+        rule = build_lifecycle_rule(config)
+        if rule is None:
+            return "object cleanup disabled"
+        return f"lifecycle rule expiring objects after {rule['Expiration']['Days']} day(s)"
     if config.delete_all_objects:
         return "delete all objects in targeted buckets"
     if config.object_retention_days is None:
@@ -348,13 +833,7 @@ def render_plan(summary: dict, config: CleanupConfig, *, json_output: bool = Fal
     reports = summary.get("bucket_reports") or []
     print("\nPlan (dry-run)")
     print(f"  Buckets: {summary.get('buckets_targeted', 0)} of {summary.get('buckets_scanned', 0)} matched filters")
-    if config.delete_all_objects:
-        policy = "delete all objects in targeted buckets"
-    elif config.object_retention_days is None:
-        policy = "object cleanup disabled"
-    else:
-        policy = f"delete objects older than {config.object_retention_days} day(s)"
-    print(f"  Policy: {policy}")
+    print(f"  Policy: {policy_summary(config)}")
     print(f"  Versions: {'included' if config.include_versioned_objects else 'skipped'}")
 
     if not reports:
@@ -400,8 +879,7 @@ def render_live_state(
     table.add_column("Vers", justify="right")
     table.add_column("Deleted", justify="right")
 
-    for bucket in sorted(bucket_state.keys()):
-        info = bucket_state[bucket]
+    for bucket, info in bucket_state.items():
         status = info.get("status", "pending")
         objs_planned = info.get("objects_planned", 0)
         vers_planned = info.get("versions_planned", 0)
@@ -429,13 +907,42 @@ def render_live_state(
     return Panel(Group(grid), box=box.SQUARE)
 
 
+class LiveBucketView:
+    """Live renderable over ``bucket_state``, rebuilt at most once per Live refresh.
+
+    ``record`` only stores a report and marks the view stale, so a busy run costs one render per
+    refresh, and a quiet one (a long listing with no new reports) reuses the last render.
+    """
+
+    def __init__(self, messages: List[str], config: CleanupConfig, *, dry_run: bool) -> None:
+        self.bucket_state: Dict[str, dict] = {}
+        self._messages = messages
+        self._config = config
+        self._dry_run = dry_run
+        self._lock = threading.Lock()
+        self._rendered: Optional[Panel] = None
+
+    def record(self, report: Dict[str, object]) -> None:
+        """Progress callback for ``run_cleanup``."""
+        with self._lock:
+            self.bucket_state[report["bucket"]] = report  # type: ignore[index]
+            self._rendered = None
+
+    def __rich__(self) -> Panel:
+        with self._lock:
+            if self._rendered is None:
+                self._rendered = render_live_state(
+                    self.bucket_state, self._messages, self._config, dry_run=self._dry_run
+                )
+            return self._rendered
+
+
 def main() -> None:
     args = parse_args()
     logging.basicConfig(
         level=logging.DEBUG if args.verbose else logging.INFO,
         format="%(levelname)s %(message)s",
     )
-    console = Console()
     live_enabled = args.live if getattr(args, "live", None) is not None else sys.stdout.isatty()
     if args.json_output:
         live_enabled = False
@@ -454,30 +961,14 @@ def main() -> None:
 
     # One-off include/exclude tweaks without editing the config file.
     if args.include_buckets:
-        for bucket in args.include_buckets:
-            if bucket not in config.target_buckets:
-                config.target_buckets.append(bucket)
+        config.target_buckets = list(dict.fromkeys(config.target_buckets + args.include_buckets))
     if args.exclude_buckets:
-        for bucket in args.exclude_buckets:
-            if bucket not in config.ignore_buckets:
-                config.ignore_buckets.append(bucket)
+        config.ignore_buckets = list(dict.fromkeys(config.ignore_buckets + args.exclude_buckets))
 
     buckets_override = args.bucket
-    bucket_state: Dict[str, dict] = {}
     messages: List[str] = []
-    live_instance: Optional[Live] = None
-
-    def progress_cb(report: Dict[str, object]) -> None:
-        bucket_state[report["bucket"]] = report  # type: ignore[index]
-        if live_instance:
-            live_instance.update(
-                render_live_state(
-                    bucket_state,
-                    messages,
-                    config,
-                    dry_run=not args.apply,
-                )
-            )
+    # Tags and empty buckets found while planning are reused by the apply pass
+    bucket_cache = BucketCache()
 
     if args.apply:
         if config.delete_all_objects and not args.force_delete_all:
@@ -501,6 +992,7 @@ def main() -> None:
             dry_run=True,
             buckets_override=buckets_override,
             collect_details=True,
+            cache=bucket_cache,
         )
         render_plan(plan_summary, config, json_output=args.json_output)
 
@@ -521,26 +1013,23 @@ def main() -> None:
 
     collect_details = args.json_output
     if live_enabled:
-        with Live(
-            render_live_state(bucket_state, messages, config, dry_run=not args.apply),
-            console=console,
-            refresh_per_second=4,
-        ) as live:
-            live_instance = live
+        view = LiveBucketView(messages, config, dry_run=not args.apply)
+        with Live(view, console=CONSOLE, refresh_per_second=4):
             summary = run_cleanup(
                 config,
                 dry_run=not args.apply,
                 buckets_override=buckets_override,
                 collect_details=collect_details,
-                progress_callback=progress_cb,
+                progress_callback=view.record,
+                cache=bucket_cache,
             )
-            live_instance = None
     else:
         summary = run_cleanup(
             config,
             dry_run=not args.apply,
             buckets_override=buckets_override,
             collect_details=collect_details,
+            cache=bucket_cache,
         )
 
     if args.json_output:
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aws_automations import config as config_module  # noqa: E402
+from aws_automations.config import CleanupConfig, read_config_file  # noqa: E402
+
+SAMPLE_YAML = """\
+region_name: us-east-1
+s3:
+  bucket_prefixes: [sandbox-, scratch-]
+  object_retention_days: 7
+  require_tag: {key: cleanup, value: "true"}
+"""
+
+SAMPLE_TOML = """\
+region_name = "us-east-1"
+
+[s3]
+bucket_prefixes = ["sandbox-", "scratch-"]
+object_retention_days = 7
+require_tag = { key = "cleanup", value = "true" }
+"""
+
+
+def _read_fresh(path: Path):
+    config_module._parse_config_file.cache_clear()
+    return read_config_file(path)
+
+
+def test_yaml_sidecar_is_only_used_for_the_same_contents(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("region_name: us-east-1\n")
+    assert _read_fresh(config_path) == {"region_name": "us-east-1"}
+
+    sidecar = tmp_path / "config.yaml.cache.json"
+    envelope = json.loads(sidecar.read_text())
+    assert envelope["data"] == {"region_name": "us-east-1"}
+
+    # An edit that keeps the old mtime and size must still be picked up
+    stat = config_path.stat()
+    config_path.write_text("region_name: eu-west-1\n")
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.utime(sidecar, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _read_fresh(config_path) == {"region_name": "eu-west-1"}
+
+
+def test_yaml_sidecar_with_matching_source_is_reused(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("region_name: us-east-1\n")
+    _read_fresh(config_path)
+
+    sidecar = tmp_path / "config.yaml.cache.json"
+    envelope = json.loads(sidecar.read_text())
+    envelope["data"] = {"region_name": "from-sidecar"}
+    sidecar.write_text(json.dumps(envelope))
+    assert _read_fresh(config_path) == {"region_name": "from-sidecar"}
+
+    # Sidecars without the source envelope are ignored
+    sidecar.write_text(json.dumps({"region_name": "stale"}))
+    assert _read_fresh(config_path) == {"region_name": "us-east-1"}
+
+
+def test_toml_and_yaml_configs_parse_the_same(tmp_path):
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text(SAMPLE_YAML)
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text(SAMPLE_TOML)
+
+    assert _read_fresh(toml_path) == _read_fresh(yaml_path)
+    assert CleanupConfig.from_file(toml_path) == CleanupConfig.from_file(yaml_path)
+
+
+def test_toml_configs_bypass_the_sidecar(tmp_path):
+    toml_path = tmp_path / "config.toml"
+    toml_path.write_text(SAMPLE_TOML)
+    # A sidecar next to a TOML config, e.g. left from a renamed YAML file, is never read
+    (tmp_path / "config.toml.cache.json").write_text(json.dumps({"source": {}, "data": {"region_name": "stale"}}))
+
+    assert _read_fresh(toml_path)["region_name"] == "us-east-1"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["config.toml", "config.toml.cache.json"]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aws_automations import ebs_cleanup  # noqa: E402
+
+
+@pytest.fixture()
+def ec2_client():
+    with mock_aws():
+        yield boto3.client("ec2", region_name="us-east-1")
+
+
+def test_throttled_run_returns_partial_summary(ec2_client, monkeypatch):
+    volume_ids = [ec2_client.create_volume(AvailabilityZone="us-east-1a", Size=1)["VolumeId"] for _ in range(3)]
+    throttled_id = volume_ids[1]
+    real_delete_volume = ebs_cleanup.delete_volume
+
+    def delete_volume(client, volume_id, dry_run):
+        if volume_id == throttled_id:
+            raise ClientError({"Error": {"Code": "RequestLimitExceeded", "Message": "slow down"}}, "DeleteVolume")
+        return real_delete_volume(client, volume_id, dry_run)
+
+    monkeypatch.setattr(ebs_cleanup, "delete_volume", delete_volume)
+
+    config = {"region_name": "us-east-1", "volume_retention_days": 0, "max_workers": 1}
+    summary = ebs_cleanup.run_ebs_cleanup(config, dry_run=False)
+
+    assert throttled_id in summary["throttled"]
+    # Every candidate is either reported as processed or listed as throttled
+    reported = {report["volume_id"] for report in summary["volume_reports"]}
+    throttled_volumes = {resource_id for resource_id in summary["throttled"] if resource_id.startswith("vol-")}
+    assert reported | throttled_volumes == set(volume_ids)
+    assert not reported & throttled_volumes
+    assert summary["volumes_deleted"] == len(reported)
+
+
+def test_throttled_volume_pass_skips_snapshots(ec2_client, monkeypatch):
+    volume_id = ec2_client.create_volume(AvailabilityZone="us-east-1a", Size=1)["VolumeId"]
+    snapshot_id = ec2_client.create_snapshot(VolumeId=volume_id)["SnapshotId"]
+
+    def delete_volume(client, volume_id, dry_run):
+        raise ClientError({"Error": {"Code": "RequestLimitExceeded", "Message": "slow down"}}, "DeleteVolume")
+
+    def delete_snapshot(client, snapshot_id, dry_run):
+        raise AssertionError("snapshot pass ran on a throttled account")
+
+    monkeypatch.setattr(ebs_cleanup, "delete_volume", delete_volume)
+    monkeypatch.setattr(ebs_cleanup, "delete_snapshot", delete_snapshot)
+
+    config = {
+        "region_name": "us-east-1",
+        "volume_retention_days": 0,
+        "snapshot_retention_days": 0,
+        "target_snapshots": [snapshot_id],
+    }
+    summary = ebs_cleanup.run_ebs_cleanup(config, dry_run=False)
+
+    assert summary["throttled"] == [volume_id, snapshot_id]
+    assert summary["snapshots_deleted"] == 0
+    assert summary["snapshot_reports"] == []
+    assert ec2_client.describe_snapshots(SnapshotIds=[snapshot_id])["Snapshots"]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import boto3
+import pytest
+from moto import mock_aws
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aws_automations.iam_cleanup import run_iam_cleanup  # noqa: E402
+
+ASSUME_ROLE_POLICY = json.dumps(
+    {
+        "Version": "2012-10-17",
+        "Statement": [{"Effect": "Allow", "Principal": {"Service": "ec2.amazonaws.com"}, "Action": "sts:AssumeRole"}],
+    }
+)
+PERMISSIONS_POLICY = json.dumps(
+    {"Version": "2012-10-17", "Statement": [{"Effect": "Allow", "Action": "s3:ListBucket", "Resource": "*"}]}
+)
+
+
+@pytest.fixture()
+def iam_client():
+    with mock_aws():
+        yield boto3.client("iam", region_name="us-east-1")
+
+
+def test_aws_owned_and_active_resources_are_never_targeted(iam_client):
+    now = datetime.now(timezone.utc)
+    long_ago = now - timedelta(days=90)
+
+    iam_client.create_role(
+        RoleName="sandbox-linked",
+        Path="/aws-service-role/ec2.amazonaws.com/",
+        AssumeRolePolicyDocument=ASSUME_ROLE_POLICY,
+    )
+    iam_client.create_role(RoleName="sandbox-stale", AssumeRolePolicyDocument=ASSUME_ROLE_POLICY)
+    iam_client.create_user(UserName="sandbox-active")
+    iam_client.create_user(UserName="sandbox-idle")
+    iam_client.create_policy(PolicyName="sandbox-local", PolicyDocument=PERMISSIONS_POLICY)
+    managed_policy = {
+        "PolicyName": "sandbox-managed",
+        "PolicyId": "ANPAEXAMPLEMANAGED",
+        "Arn": "arn:aws:iam::aws:policy/sandbox-managed",
+        "CreateDate": long_ago,
+        "AttachmentCount": 0,
+    }
+
+    # Moto never reports PasswordLastUsed and stamps every record with the current time, so the
+    # responses are aged here: everything is 90 days old and one user signed in yesterday.
+    def age_users(parsed, **kwargs):
+        for user in parsed.get("Users", []):
+            if user["UserName"] == "sandbox-active":
+                user["PasswordLastUsed"] = now - timedelta(days=1)
+
+    def age_details(parsed, **kwargs):
+        for key in ("RoleDetailList", "UserDetailList", "Policies"):
+            for record in parsed.get(key, []):
+                record["CreateDate"] = long_ago
+        for policy in parsed.get("Policies", []):
+            # Moto leaves PolicyName out of the managed policy details
+            policy.setdefault("PolicyName", policy["Arn"].rsplit("/", 1)[-1])
+        parsed.setdefault("Policies", []).append(dict(managed_policy))
+
+    session = boto3.Session(region_name="us-east-1")
+    session.events.register("after-call.iam.ListUsers", age_users)
+    session.events.register("after-call.iam.GetAccountAuthorizationDetails", age_details)
+
+    config = {"region_name": "us-east-1", "name_patterns": ["sandbox-*"], "max_workers": 2}
+    summary = run_iam_cleanup(config, dry_run=False, session=session)
+
+    targeted = {report["resource_name"] for report in summary["iam_reports"]}
+    assert targeted == {"sandbox-stale", "sandbox-idle", "sandbox-local"}
+    assert summary["roles_deleted"] == 1
+    assert summary["users_deleted"] == 1
+    assert summary["policies_deleted"] == 1
+
+    roles = {role["RoleName"] for role in iam_client.list_roles()["Roles"]}
+    users = {user["UserName"] for user in iam_client.list_users()["Users"]}
+    assert "sandbox-linked" in roles
+    assert "sandbox-stale" not in roles
+    assert users == {"sandbox-active"}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from aws_automations.main import default_args, run, service_has_work, service_skip_reason  # noqa: E402
+
+# The package re-exports main(), which shadows the module attribute of the same name
+cli = importlib.import_module("aws_automations.main")
+
+STUB_RESULTS = {
+    "ec2": {"dry_run": True, "instances_scanned": 2, "instance_reports": [{"instance_id": "i-0123"}]},
+    "lambda": {"dry_run": True, "functions_scanned": 1, "function_reports": []},
+}
+
+STUB_CONFIG = {"region_name": "us-east-1", "ec2": {"max_workers": 1}, "lambda": {"max_workers": 1}}
+
+
+@pytest.fixture()
+def stub_services(tmp_path, monkeypatch):
+    """Write a config for the stubbed services and return its path; no AWS calls are made."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(STUB_CONFIG))
+
+    def run_service_cleanup(service, service_config, dry_run, progress_callback=None, **kwargs):
+        return STUB_RESULTS[service]
+
+    monkeypatch.setattr(cli, "run_service_cleanup", run_service_cleanup)
+    return str(config_path)
+
+
+@pytest.mark.parametrize("explicit, expected", [(False, "no config section"), (True, None)])
+def test_service_without_section_only_runs_when_named(explicit, expected):
+    config = {"region_name": "us-east-1", "ec2": {"instance_retention_days": 7}}
+
+    assert service_skip_reason("lambda", config, explicit) == expected
+    assert service_skip_reason("ec2", config, explicit) is None
+
+
+@pytest.mark.parametrize("explicit", [False, True])
+def test_disabled_section_is_skipped_even_when_named(explicit):
+    config = {"ec2": {"enabled": False, "instance_retention_days": 7}}
+
+    assert service_skip_reason("ec2", config, explicit) == "disabled in config"
+
+
+def test_top_level_s3_settings_count_as_a_section():
+    config = {"region_name": "us-east-1", "bucket_prefixes": ["sandbox-"]}
+
+    assert service_skip_reason("s3", config) is None
+    assert service_skip_reason("s3", {"region_name": "us-east-1"}) == "no config section"
+
+
+def test_empty_ec2_target_states_leave_no_work():
+    assert not service_has_work("ec2", {"target_states": []})
+    assert service_has_work("ec2", {"target_states": ["stopped"]})
+    assert service_has_work("ec2", {})
+    # An empty list elsewhere means "no restriction"
+    assert service_has_work("lambda", {"name_patterns": []})
+
+
+def test_json_stream_writes_one_line_per_service(stub_services, capsysbinary):
+    run(default_args(config=stub_services, json_stream=True, live=False))
+
+    lines = capsysbinary.readouterr().out.splitlines()
+    assert len(lines) == len(STUB_RESULTS)
+    streamed = {}
+    for line in lines:
+        record = json.loads(line)
+        assert len(record) == 1
+        streamed.update(record)
+    assert streamed == STUB_RESULTS
+
+
+def test_msgpack_output_round_trips(stub_services, capsysbinary):
+    msgpack = pytest.importorskip("msgpack")
+
+    run(default_args(config=stub_services, json=True, output="msgpack", live=False))
+    assert msgpack.unpackb(capsysbinary.readouterr().out) == STUB_RESULTS
+
+    run(default_args(config=stub_services, json_stream=True, output="msgpack", live=False))
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(capsysbinary.readouterr().out)
+    streamed = {}
+    for record in unpacker:
+        streamed.update(record)
+    assert streamed == STUB_RESULTS
+
+
+def test_msgpack_falls_back_to_json_on_a_terminal(stub_services, capsysbinary, monkeypatch):
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+
+    run(default_args(config=stub_services, json=True, output="msgpack", live=False))
+
+    assert json.loads(capsysbinary.readouterr().out) == STUB_RESULTS
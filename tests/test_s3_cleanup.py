@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 import boto3
 import pytest
+from botocore.stub import Stubber
 from moto import mock_aws
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from aws_automations import s3_cleanup  # noqa: E402
 from aws_automations.config import CleanupConfig  # noqa: E402
-from aws_automations.s3_cleanup import run_cleanup  # noqa: E402
+from aws_automations.s3_cleanup import (  # noqa: E402
+    BucketCache,
+    delete_batch,
+    iter_bucket_deletions,
+    listing_covers_bucket,
+    run_cleanup,
+)
 
 
 @pytest.fixture()
@@ -100,3 +109,137 @@ def test_tag_filter_limits_scope(s3_client):
     assert summary["objects_deleted"] >= 1
     assert tagged_objects.get("KeyCount", 0) == 0
     assert untagged_objects.get("KeyCount", 0) == 1
+
+
+def test_prefix_partitions_stream_through_a_small_queue(s3_client, monkeypatch):
+    # A one-page queue makes the partition workers wait on the consumer throughout the listing
+    monkeypatch.setattr(s3_cleanup, "LISTING_QUEUE_PAGES", 1)
+    buckets = ["sandbox-one", "sandbox-two"]
+    for bucket in buckets:
+        s3_client.create_bucket(Bucket=bucket)
+        for prefix in ("a/", "b/", "c/", "other/"):
+            for index in range(3):
+                s3_client.put_object(Bucket=bucket, Key=f"{prefix}{index}", Body=b"data")
+
+    config = CleanupConfig(
+        region_name="us-east-1",
+        bucket_prefixes=["sandbox-"],
+        bucket_retention_days=0,
+        object_retention_days=0,
+        delete_all_objects=True,
+        list_prefix_partitions=["a/", "b/", "c/"],
+        max_workers=2,
+    )
+    summary = run_cleanup(config, dry_run=False)
+
+    assert summary["objects_deleted"] == 18
+    for bucket in buckets:
+        remaining = [obj["Key"] for obj in s3_client.list_objects_v2(Bucket=bucket).get("Contents", [])]
+        assert sorted(remaining) == ["other/0", "other/1", "other/2"]
+
+
+def test_lifecycle_mode_keeps_other_rules_and_replaces_its_own(s3_client):
+    bucket = "sandbox-lifecycle"
+    s3_client.create_bucket(Bucket=bucket)
+    s3_client.put_object(Bucket=bucket, Key="old.txt", Body=b"data")
+    existing_rule = {
+        "ID": "keep-logs-90-days",
+        "Status": "Enabled",
+        "Filter": {"Prefix": "logs/"},
+        "Expiration": {"Days": 90},
+    }
+    s3_client.put_bucket_lifecycle_configuration(Bucket=bucket, LifecycleConfiguration={"Rules": [existing_rule]})
+
+    config = CleanupConfig(
+        region_name="us-east-1",
+        bucket_prefixes=["sandbox-"],
+        bucket_retention_days=0,
+        object_retention_days=7,
+        use_lifecycle_for_bulk=True,
+    )
+    first = run_cleanup(config, dry_run=False)
+    config.object_retention_days = 14
+    second = run_cleanup(config, dry_run=False)
+
+    rules = {rule["ID"]: rule for rule in s3_client.get_bucket_lifecycle_configuration(Bucket=bucket)["Rules"]}
+    assert sorted(rules) == sorted([existing_rule["ID"], s3_cleanup.LIFECYCLE_RULE_ID])
+    assert rules[existing_rule["ID"]]["Expiration"] == {"Days": 90}
+    assert rules[s3_cleanup.LIFECYCLE_RULE_ID]["Expiration"] == {"Days": 14}
+    assert first["lifecycle_rules_set"] == second["lifecycle_rules_set"] == 1
+    # S3 expires the objects itself, so nothing is deleted by the run
+    assert second["objects_deleted"] == 0
+    assert s3_client.list_objects_v2(Bucket=bucket)["KeyCount"] == 1
+
+
+def test_versioned_bucket_is_walked_once_and_classified(s3_client):
+    bucket = "sandbox-versioned"
+    s3_client.create_bucket(Bucket=bucket)
+    s3_client.put_bucket_versioning(Bucket=bucket, VersioningConfiguration={"Status": "Enabled"})
+    s3_client.put_object(Bucket=bucket, Key="rewritten.txt", Body=b"v1")
+    s3_client.put_object(Bucket=bucket, Key="rewritten.txt", Body=b"v2")
+    s3_client.put_object(Bucket=bucket, Key="removed.txt", Body=b"v1")
+    s3_client.delete_object(Bucket=bucket, Key="removed.txt")
+    s3_client.put_object(Bucket=bucket, Key="current.txt", Body=b"v1")
+
+    config = CleanupConfig(
+        region_name="us-east-1",
+        bucket_prefixes=["sandbox-"],
+        bucket_retention_days=0,
+        object_retention_days=0,
+        delete_all_objects=True,
+        delete_empty_buckets=True,
+    )
+    entries = list(iter_bucket_deletions(s3_client, bucket, config, datetime.now(timezone.utc)))
+
+    # Current versions count as objects; older versions and delete markers, even a latest one, as versions
+    objects = sorted(key for kind, key, _ in entries if kind == "objects")
+    versions = sorted(key for kind, key, _ in entries if kind == "versions")
+    assert objects == ["current.txt", "rewritten.txt"]
+    assert versions == ["removed.txt", "removed.txt", "rewritten.txt"]
+    assert all(version_id for _, _, version_id in entries)
+
+    summary = run_cleanup(config, dry_run=False)
+
+    assert summary["objects_deleted"] == 2
+    assert summary["versions_deleted"] == 3
+    assert summary["buckets_deleted"] == 1
+
+
+def test_delete_batch_counts_only_keys_without_errors(s3_client):
+    batch = [{"Key": "first.txt"}, {"Key": "locked.txt"}, {"Key": "last.txt"}]
+    stubber = Stubber(s3_client)
+    stubber.add_response(
+        "delete_objects",
+        {"Errors": [{"Key": "locked.txt", "Code": "AccessDenied", "Message": "Access Denied"}]},
+        {"Bucket": "sandbox-errors", "Delete": {"Objects": batch, "Quiet": True}},
+    )
+
+    with stubber:
+        assert delete_batch(s3_client, "sandbox-errors", batch, dry_run=False) == 2
+    stubber.assert_no_pending_responses()
+
+
+def test_partitioned_listing_never_marks_bucket_empty(s3_client):
+    bucket = "sandbox-partial"
+    s3_client.create_bucket(Bucket=bucket)
+    s3_client.put_object(Bucket=bucket, Key="a/listed.txt", Body=b"data")
+    s3_client.put_object(Bucket=bucket, Key="unlisted.txt", Body=b"data")
+
+    config = CleanupConfig(
+        region_name="us-east-1",
+        bucket_prefixes=["sandbox-"],
+        bucket_retention_days=0,
+        object_retention_days=0,
+        delete_all_objects=True,
+        delete_empty_buckets=True,
+        list_prefix_partitions=["a/"],
+    )
+    cache = BucketCache()
+    summary = run_cleanup(config, dry_run=False, cache=cache)
+
+    # Every listed key was deleted, but keys outside the partitions were never seen
+    assert summary["objects_deleted"] == 1
+    assert not listing_covers_bucket(s3_client, bucket, config, cache)
+    assert bucket not in cache.empty
+    assert summary["buckets_deleted"] == 0
+    assert [obj["Key"] for obj in s3_client.list_objects_v2(Bucket=bucket)["Contents"]] == ["unlisted.txt"]